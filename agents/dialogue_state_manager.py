@@ -3,11 +3,19 @@ Dialogue State Manager for Multi-turn Conversation Handling
 Implements rule-based intent persistence and slot filling without ML
 """
 
+import functools
 import re
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+from data.order_id import extract_numeric_order_id
+
 class Intent(Enum):
     """Supported intents for the chatbot"""
     CUSTOMER_LOOKUP = "customer_lookup"  # NEW: Customer ID lookup
@@ -38,6 +46,37 @@ class DialogueState:
         self.workflow_completed = False
         print("🔄 Dialogue state reset - ready for new conversation")
 
+@functools.lru_cache(maxsize=None)
+def _compile_intent_matchers(intent_priority):
+    """
+    Compile the priority-ordered keyword table once per process.
+    Every DialogueStateManager with the same table shares the result.
+    Returns: (intent regex, Aho-Corasick automaton or None)
+    """
+    # All lists specialized into ONE regex: one lookahead branch per intent,
+    # tried in priority order at position 0, so the first branch whose
+    # keywords occur anywhere in the message wins (lastgroup = intent name)
+    intent_re = re.compile(
+        '|'.join(
+            f"(?=.*?(?P<{intent.name}>{'|'.join(map(re.escape, keywords))}))"
+            for intent, keywords, _ in intent_priority
+        ),
+        re.DOTALL
+    )
+    
+    # With pyahocorasick, every keyword of every intent is matched in one
+    # automaton pass; each keyword maps to its intent's priority index
+    automaton = None
+    if ahocorasick:
+        automaton = ahocorasick.Automaton()
+        for priority, (_, keywords, _) in enumerate(intent_priority):
+            for keyword in keywords:
+                if keyword not in automaton:
+                    automaton.add_word(keyword, priority)
+        automaton.make_automaton()
+    
+    return intent_re, automaton
+
 class DialogueStateManager:
     """
     Manages dialogue state and intent persistence for multi-turn conversations.
@@ -103,6 +142,26 @@ class DialogueStateManager:
             ]
         }
         
+        # Keyword lists in the strict priority order _detect_intent checks them in
+        intent_priority = (
+            # 1. HIGHEST PRIORITY: customer_lookup
+            (Intent.CUSTOMER_LOOKUP, tuple(self.CUSTOMER_LOOKUP_KEYWORDS), "CUSTOMER_LOOKUP (HIGHEST PRIORITY)"),
+            # 2. SECOND PRIORITY: order_detail_query (READ-ONLY information)
+            (Intent.ORDER_DETAIL_QUERY, tuple(self.ORDER_DETAIL_KEYWORDS), "ORDER_DETAIL_QUERY (SECOND PRIORITY)"),
+            # 3. Return/Cancel orders (MUST be checked before FAQ to catch cancellations)
+            (Intent.RETURN_ORDER, tuple(self.intent_keywords[Intent.RETURN_ORDER]), "RETURN_ORDER"),
+            # 4. Order status tracking
+            (Intent.ORDER_STATUS, tuple(self.intent_keywords[Intent.ORDER_STATUS]), "ORDER_STATUS"),
+            # 5. Billing issues (LOWER PRIORITY - cannot override order details)
+            (Intent.BILLING_ISSUE, tuple(self.BILLING_ISSUE_KEYWORDS), "BILLING_ISSUE"),
+            # 6. FAQ - General queries (ONLY for non-order related queries)
+            (Intent.FAQ, tuple(self.intent_keywords[Intent.FAQ]), "FAQ"),
+        )
+        
+        self._intent_order = [intent for intent, _, _ in intent_priority]
+        self._intent_labels = {intent: label for intent, _, label in intent_priority}
+        self._intent_re, self._intent_automaton = _compile_intent_matchers(intent_priority)
+        
         # Required slots for each intent
         self.required_slots = {
             Intent.CUSTOMER_LOOKUP: ['customer_id'],  # NEW: Customer ID lookup
@@ -162,45 +221,34 @@ class DialogueStateManager:
         Detect intent using rule-based keyword matching with STRICT PRIORITY ORDER.
         MANDATORY: order_detail_query has HIGHEST PRIORITY and MUST NOT be overridden.
         """
-        message_lower = message.lower()
+        intent = self._match_intent(message.lower())
+        if intent is not None:
+            print(f"🔍 Intent detected: {self._intent_labels[intent]}")
+            return intent
         
+        # 7. Fallback - if no specific keywords, treat as FAQ
+        print(f"🔍 No specific intent detected - defaulting to FAQ")
+        return Intent.FAQ
+    
+    def detect_intents_batch(self, messages: List[str]) -> List[Intent]:
+        """
+        Detect intents for many messages in one call (same rules as _detect_intent).
+        Stateless and silent - no per-message logging.
+        """
+        match_intent = self._match_intent
+        return [match_intent(message.lower()) or Intent.FAQ for message in messages]
+    
+    def _match_intent(self, message_lower: str) -> Optional[Intent]:
+        """Highest-priority intent whose keywords occur in the message, or None"""
         # ============================================================================
-        # STRICT PRIORITY ORDER (NON-NEGOTIABLE)
+        # STRICT PRIORITY ORDER (NON-NEGOTIABLE) - first matching pattern wins
         # ============================================================================
+        if self._intent_automaton is not None:
+            priority = min((hit for _, hit in self._intent_automaton.iter(message_lower)), default=None)
+            return None if priority is None else self._intent_order[priority]
         
-        # 1. HIGHEST PRIORITY: customer_lookup
-        if any(keyword in message_lower for keyword in self.CUSTOMER_LOOKUP_KEYWORDS):
-            print(f"🔍 Intent detected: CUSTOMER_LOOKUP (HIGHEST PRIORITY)")
-            return Intent.CUSTOMER_LOOKUP
-        
-        # 2. SECOND PRIORITY: order_detail_query (READ-ONLY information)
-        if any(keyword in message_lower for keyword in self.ORDER_DETAIL_KEYWORDS):
-            print(f"🔍 Intent detected: ORDER_DETAIL_QUERY (SECOND PRIORITY)")
-            return Intent.ORDER_DETAIL_QUERY
-        
-        # 2. Return/Cancel orders (MUST be checked before FAQ to catch cancellations)
-        if any(keyword in message_lower for keyword in self.intent_keywords[Intent.RETURN_ORDER]):
-            print(f"🔍 Intent detected: RETURN_ORDER")
-            return Intent.RETURN_ORDER
-        
-        # 3. Order status tracking
-        if any(keyword in message_lower for keyword in self.intent_keywords[Intent.ORDER_STATUS]):
-            print(f"🔍 Intent detected: ORDER_STATUS")
-            return Intent.ORDER_STATUS
-        
-        # 4. Billing issues (LOWER PRIORITY - cannot override order details)
-        if any(keyword in message_lower for keyword in self.BILLING_ISSUE_KEYWORDS):
-            print(f"🔍 Intent detected: BILLING_ISSUE")
-            return Intent.BILLING_ISSUE
-        
-        # 5. FAQ - General queries (ONLY for non-order related queries)
-        if any(keyword in message_lower for keyword in self.intent_keywords[Intent.FAQ]):
-            print(f"🔍 Intent detected: FAQ")
-            return Intent.FAQ
-        
-        # 6. Fallback - if no specific keywords, treat as FAQ
-        print(f"🔍 No specific intent detected - defaulting to FAQ")
-        return Intent.FAQ
+        match = self._intent_re.match(message_lower)
+        return Intent[match.lastgroup] if match else None
     
     def _extract_order_id(self, message: str) -> Optional[int]:
         """
@@ -209,9 +257,8 @@ class DialogueStateManager:
         Extract ONLY the numeric portion and return as integer.
         """
         # STRICT RULE: Extract FIRST numeric sequence from ANY format
-        match = re.search(r'(\d+)', message)
-        if match:
-            order_id = int(match.group(1))
+        order_id = extract_numeric_order_id(message)
+        if order_id is not None:
             print(f"📋 Extracted order ID: {order_id} from input: '{message}'")
             return order_id
         
@@ -499,10 +546,8 @@ class DialogueStateManager:
         elif hasattr(session, 'persistent_entities') and 'order_number' in session.persistent_entities:
             order_id_str = session.persistent_entities['order_number']
             # Extract numeric portion from order number
-            import re
-            match = re.search(r'(\d+)', str(order_id_str))
-            if match:
-                order_id = int(match.group(1))
+            order_id = extract_numeric_order_id(order_id_str)
+            if order_id is not None:
                 # Store in dialogue context for this workflow
                 dialogue_state.context['order_id'] = order_id
                 print(f"🔄 Reusing order_id {order_id} from session persistent entities")
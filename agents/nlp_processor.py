@@ -1,7 +1,229 @@
+import functools
 import re
 from typing import Dict, List, Tuple, Any
 from datetime import datetime, timedelta
 
+# Bump when ENTITY_PATTERNS or the extraction rules change, so cached
+# entity results from the old rules are never reused
+ENTITY_EXTRACTOR_VERSION = 1
+# Same, for the complete-request detection rules
+COMPLETE_REQUEST_DETECTOR_VERSION = 1
+
+ENTITY_PATTERNS = {
+    "order_number": [
+        r"#(\d{3,8})",  # #12345 - only digits after #
+        r"order\s*#?\s*(\d{3,8})",  # order 12345 or order #12345 - only digits
+        r"\border\s+(\d{3,8})\b",  # order 12345 - only digits, word boundary
+        r"\b([A-Z]{2,3}\d{4,6})\b"  # ABC1234 format - letters followed by digits
+    ],
+    "product_name": [
+        r"product\s+([A-Za-z0-9\s]+?)(?:\s|$)",
+        r"item\s+([A-Za-z0-9\s]+?)(?:\s|$)",
+        r"([A-Za-z]+\s*\d+[A-Za-z]*)",  # iPhone14, MacBook Pro
+        r"(apples?|bananas?|oranges?|grapes?|strawberr(?:y|ies)|laptop|phone|tablet|headphones?|shoes?|shirt|dress|book|chair|table)",  # Common products
+    ],
+    "ordered_product": [
+        r"ordered\s+([A-Za-z\s]+?)(?:\s|$)",
+        r"bought\s+([A-Za-z\s]+?)(?:\s|$)",
+        r"purchased\s+([A-Za-z\s]+?)(?:\s|$)",
+        r"supposed\s+to\s+get\s+([A-Za-z\s]+?)(?:\s|$)",
+        r"expected\s+([A-Za-z\s]+?)(?:\s|$)",
+        r"wanted\s+([A-Za-z\s]+?)(?:\s|$)",
+    ],
+    "received_product": [
+        r"got\s+([A-Za-z\s]+?)(?:\s|$)",
+        r"received\s+([A-Za-z\s]+?)(?:\s|$)",
+        r"delivered\s+([A-Za-z\s]+?)(?:\s|$)",
+        r"sent\s+me\s+([A-Za-z\s]+?)(?:\s|$)",
+        r"came\s+with\s+([A-Za-z\s]+?)(?:\s|$)",
+        r"instead\s+of\s+.*got\s+([A-Za-z\s]+?)(?:\s|$)",
+    ],
+    "delivery_issue": [
+        r"(delayed|late|missing|lost|damaged|broken|wrong|incorrect)",
+        r"(not.*delivered|never.*arrived|still.*waiting)",
+    ],
+    "date": [
+        r"(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})",  # 12/25/2023
+        r"(today|tomorrow|yesterday)",
+        r"(\d{1,2}\s+(days?|weeks?|months?)\s+ago)",
+        r"(next\s+week|last\s+week|this\s+week)"
+    ],
+    "email": [
+        r"([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})"
+    ],
+    "phone": [
+        r"(\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4})"
+    ],
+    "issue_type": [
+        r"(refund|return|exchange|replacement|cancel|billing|account|technical|login|password)"
+    ]
+}
+
+@functools.lru_cache(maxsize=16384)
+def _extract_entities_cached(message: str, version: int) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """
+    Extract entities from the message using regex patterns.
+    Memoized at module scope, so every NLPProcessor shares the results.
+    """
+    entities = []
+    
+    for entity_type, patterns in ENTITY_PATTERNS.items():
+        matches = []
+        for pattern in patterns:
+            found = re.findall(pattern, message, re.IGNORECASE)
+            if found:
+                # Flatten nested matches and clean up
+                for match in found:
+                    if isinstance(match, tuple):
+                        match = match[0] if match[0] else match[1] if len(match) > 1 else ""
+                    if match and match.strip():
+                        clean_match = match.strip().lower()
+                        # Filter out common words that aren't actually entities
+                        if entity_type in ["product_name", "ordered_product", "received_product"]:
+                            if len(clean_match) > 2 and clean_match not in ["the", "and", "but", "got", "item", "product"]:
+                                matches.append(clean_match)
+                        else:
+                            matches.append(match.strip())
+        
+        if matches:
+            entities.append((entity_type, tuple(set(matches))))  # Remove duplicates
+    
+    return tuple(entities)
+
+def _classify_complete_request(message: str) -> Dict[str, Any]:
+    """
+    CRITICAL: Detect if message contains COMPLETE support request.
+    COMPLETE = order_id + issue + resolution ALL present.
+    If COMPLETE = true: STOP routing, STOP questions, SELECT final response.
+    
+    TRACKING SHORT-CIRCUIT: If intent == TRACKING and order_id exists:
+    - DO NOT ask refund/replacement/cancel
+    - DO NOT route to SupportAgent  
+    - DIRECTLY return tracking response
+    """
+    message_lower = message.lower()
+    
+    # TRACKING SHORT-CIRCUIT LOGIC (VERY IMPORTANT)
+    tracking_keywords = ["track", "tracking", "status", "where is", "when will", "delivery", "shipment", "shipped", "delivered", "eta", "arrive"]
+    is_tracking_request = any(keyword in message_lower for keyword in tracking_keywords)
+    
+    if is_tracking_request:
+        # Extract order_id for tracking
+        order_id = None
+        order_patterns = [
+            r"order\s*#?\s*([A-Z0-9]{3,8})",  # order 12345 or order #ABC123
+            r"#([A-Z0-9]{3,8})",  # #12345
+            r"\b(\d{4,8})\b",  # 4-8 digit numbers as standalone words
+            r"\b([A-Z]{2,3}\d{4,6})\b"  # ABC1234 format
+        ]
+        
+        for pattern in order_patterns:
+            match = re.search(pattern, message, re.IGNORECASE)
+            if match:
+                potential_id = match.group(1)
+                # Validate it's not a common word and is actually numeric or alphanumeric ID
+                if (potential_id.lower() not in ["is", "my", "the", "and", "but", "got", "want", "need", "status", "arrive", "delivery", "order", "track", "where", "when", "will"] and
+                    (potential_id.isdigit() or (len(potential_id) >= 3 and any(c.isdigit() for c in potential_id)))):
+                    order_id = potential_id
+                    break
+        
+        if order_id:
+            # TRACKING SHORT-CIRCUIT: Return tracking-specific response
+            return {
+                "order_id": order_id,
+                "issue": "tracking",  # Special tracking issue type
+                "resolution": "tracking",  # Special tracking resolution type
+                "is_complete": True,  # SHORT-CIRCUIT: Complete for tracking
+                "is_tracking": True  # Flag for tracking flow
+            }
+    
+    # Only process if message contains clear support indicators (NOT tracking)
+    support_indicators = ["refund", "replacement", "cancel", "wrong", "damaged", "delayed", "broken", "return"]
+    if not any(indicator in message_lower for indicator in support_indicators):
+        return {
+            "order_id": None,
+            "issue": None,
+            "resolution": None,
+            "is_complete": False,
+            "is_tracking": False
+        }
+    
+    # 1. Extract order_id via regex patterns
+    order_id = None
+    order_patterns = [
+        r"order\s*#?\s*([A-Z0-9]{3,8})",  # order 12345 or order #ABC123
+        r"#([A-Z0-9]{3,8})",  # #12345
+        r"\b(\d{4,8})\b",  # 4-8 digit numbers as standalone words
+        r"\b([A-Z]{2,3}\d{4,6})\b"  # ABC1234 format
+    ]
+    
+    for pattern in order_patterns:
+        match = re.search(pattern, message, re.IGNORECASE)
+        if match:
+            potential_id = match.group(1)
+            # Validate it's not a common word and is actually numeric or alphanumeric ID
+            if (potential_id.lower() not in ["is", "my", "the", "and", "but", "got", "want", "need", "status", "arrive", "delivery", "order", "track", "where", "when", "will"] and
+                (potential_id.isdigit() or (len(potential_id) >= 3 and any(c.isdigit() for c in potential_id)))):
+                order_id = potential_id
+                break
+    
+    # 2. Detect issue type - SIMPLIFIED (wrong item / delivery / refund / cancel)
+    issue = None
+    
+    # Wrong item detection
+    if any(keyword in message_lower for keyword in ["got wrong", "received wrong", "wrong item", "instead of", "but got", "sent wrong", "incorrect"]):
+        issue = "wrong_item"
+    
+    # Delivery issue detection  
+    elif any(keyword in message_lower for keyword in ["delayed", "late", "not arrived", "hasn't arrived", "delivery", "shipping"]):
+        issue = "delivery"
+    
+    # Damaged item detection
+    elif any(keyword in message_lower for keyword in ["damaged", "broken", "defective", "not working"]):
+        issue = "damaged"
+    
+    # 3. Detect resolution intent - EXPLICIT ONLY
+    resolution = None
+    
+    # Refund detection
+    if any(keyword in message_lower for keyword in ["refund", "money back", "want refund", "need refund"]):
+        resolution = "refund"
+    
+    # Replacement detection
+    elif any(keyword in message_lower for keyword in ["replacement", "replace", "new one", "send another"]):
+        resolution = "replacement"
+    
+    # Cancellation detection
+    elif any(keyword in message_lower for keyword in ["cancel", "cancellation", "cancel order"]):
+        resolution = "cancel"
+    
+    # 4. CRITICAL: Determine if request is COMPLETE
+    # For refund/replacement: need order_id + resolution (issue can be inferred)
+    # For cancel: need order_id + resolution only
+    if resolution in ["refund", "replacement"]:
+        # If no explicit issue but refund/replacement requested, infer general issue
+        if not issue and order_id and resolution:
+            issue = "general"
+        is_complete = bool(order_id and issue and resolution)
+    elif resolution == "cancel":
+        is_complete = bool(order_id and resolution)
+        issue = "cancel"  # Cancel is both issue and resolution
+    else:
+        is_complete = False
+    
+    return {
+        "order_id": order_id,
+        "issue": issue,
+        "resolution": resolution,
+        "is_complete": is_complete,
+        "is_tracking": False
+    }
+
+@functools.lru_cache(maxsize=16384)
+def _detect_complete_request_cached(message: str, version: int) -> Tuple[Tuple[str, Any], ...]:
+    """Memoized _classify_complete_request, shared by every NLPProcessor"""
+    return tuple(_classify_complete_request(message).items())
+
 class NLPProcessor:
     def __init__(self):
         self.intent_patterns = {
@@ -78,55 +300,8 @@ class NLPProcessor:
             }
         }
         
-        self.entity_patterns = {
-            "order_number": [
-                r"#(\d{3,8})",  # #12345 - only digits after #
-                r"order\s*#?\s*(\d{3,8})",  # order 12345 or order #12345 - only digits
-                r"\border\s+(\d{3,8})\b",  # order 12345 - only digits, word boundary
-                r"\b([A-Z]{2,3}\d{4,6})\b"  # ABC1234 format - letters followed by digits
-            ],
-            "product_name": [
-                r"product\s+([A-Za-z0-9\s]+?)(?:\s|$)",
-                r"item\s+([A-Za-z0-9\s]+?)(?:\s|$)",
-                r"([A-Za-z]+\s*\d+[A-Za-z]*)",  # iPhone14, MacBook Pro
-                r"(apples?|bananas?|oranges?|grapes?|strawberr(?:y|ies)|laptop|phone|tablet|headphones?|shoes?|shirt|dress|book|chair|table)",  # Common products
-            ],
-            "ordered_product": [
-                r"ordered\s+([A-Za-z\s]+?)(?:\s|$)",
-                r"bought\s+([A-Za-z\s]+?)(?:\s|$)",
-                r"purchased\s+([A-Za-z\s]+?)(?:\s|$)",
-                r"supposed\s+to\s+get\s+([A-Za-z\s]+?)(?:\s|$)",
-                r"expected\s+([A-Za-z\s]+?)(?:\s|$)",
-                r"wanted\s+([A-Za-z\s]+?)(?:\s|$)",
-            ],
-            "received_product": [
-                r"got\s+([A-Za-z\s]+?)(?:\s|$)",
-                r"received\s+([A-Za-z\s]+?)(?:\s|$)",
-                r"delivered\s+([A-Za-z\s]+?)(?:\s|$)",
-                r"sent\s+me\s+([A-Za-z\s]+?)(?:\s|$)",
-                r"came\s+with\s+([A-Za-z\s]+?)(?:\s|$)",
-                r"instead\s+of\s+.*got\s+([A-Za-z\s]+?)(?:\s|$)",
-            ],
-            "delivery_issue": [
-                r"(delayed|late|missing|lost|damaged|broken|wrong|incorrect)",
-                r"(not.*delivered|never.*arrived|still.*waiting)",
-            ],
-            "date": [
-                r"(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})",  # 12/25/2023
-                r"(today|tomorrow|yesterday)",
-                r"(\d{1,2}\s+(days?|weeks?|months?)\s+ago)",
-                r"(next\s+week|last\s+week|this\s+week)"
-            ],
-            "email": [
-                r"([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})"
-            ],
-            "phone": [
-                r"(\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4})"
-            ],
-            "issue_type": [
-                r"(refund|return|exchange|replacement|cancel|billing|account|technical|login|password)"
-            ]
-        }
+        # Shared module-level table (see ENTITY_PATTERNS)
+        self.entity_patterns = ENTITY_PATTERNS
     
     def process_message(self, message: str) -> Dict[str, Any]:
         """
@@ -159,30 +334,11 @@ class NLPProcessor:
         """
         Extract entities from the message using regex patterns
         """
-        entities = {}
-        
-        for entity_type, patterns in self.entity_patterns.items():
-            matches = []
-            for pattern in patterns:
-                found = re.findall(pattern, message, re.IGNORECASE)
-                if found:
-                    # Flatten nested matches and clean up
-                    for match in found:
-                        if isinstance(match, tuple):
-                            match = match[0] if match[0] else match[1] if len(match) > 1 else ""
-                        if match and match.strip():
-                            clean_match = match.strip().lower()
-                            # Filter out common words that aren't actually entities
-                            if entity_type in ["product_name", "ordered_product", "received_product"]:
-                                if len(clean_match) > 2 and clean_match not in ["the", "and", "but", "got", "item", "product"]:
-                                    matches.append(clean_match)
-                            else:
-                                matches.append(match.strip())
-            
-            if matches:
-                entities[entity_type] = list(set(matches))  # Remove duplicates
-        
-        return entities
+        # Fresh lists per call - callers may mutate the result
+        return {
+            entity_type: list(matches)
+            for entity_type, matches in _extract_entities_cached(message, ENTITY_EXTRACTOR_VERSION)
+        }
     
     def detect_issue_context(self, message: str, entities: Dict[str, List[str]]) -> Dict[str, Any]:
         """
@@ -440,130 +596,10 @@ class NLPProcessor:
         """
         CRITICAL: Detect if message contains COMPLETE support request.
         COMPLETE = order_id + issue + resolution ALL present.
-        If COMPLETE = true: STOP routing, STOP questions, SELECT final response.
-        
-        TRACKING SHORT-CIRCUIT: If intent == TRACKING and order_id exists:
-        - DO NOT ask refund/replacement/cancel
-        - DO NOT route to SupportAgent  
-        - DIRECTLY return tracking response
+        Pure function of the message, so results are memoized per message.
         """
-        message_lower = message.lower()
-        
-        # TRACKING SHORT-CIRCUIT LOGIC (VERY IMPORTANT)
-        tracking_keywords = ["track", "tracking", "status", "where is", "when will", "delivery", "shipment", "shipped", "delivered", "eta", "arrive"]
-        is_tracking_request = any(keyword in message_lower for keyword in tracking_keywords)
-        
-        if is_tracking_request:
-            # Extract order_id for tracking
-            order_id = None
-            order_patterns = [
-                r"order\s*#?\s*([A-Z0-9]{3,8})",  # order 12345 or order #ABC123
-                r"#([A-Z0-9]{3,8})",  # #12345
-                r"\b(\d{4,8})\b",  # 4-8 digit numbers as standalone words
-                r"\b([A-Z]{2,3}\d{4,6})\b"  # ABC1234 format
-            ]
-            
-            for pattern in order_patterns:
-                match = re.search(pattern, message, re.IGNORECASE)
-                if match:
-                    potential_id = match.group(1)
-                    # Validate it's not a common word and is actually numeric or alphanumeric ID
-                    if (potential_id.lower() not in ["is", "my", "the", "and", "but", "got", "want", "need", "status", "arrive", "delivery", "order", "track", "where", "when", "will"] and
-                        (potential_id.isdigit() or (len(potential_id) >= 3 and any(c.isdigit() for c in potential_id)))):
-                        order_id = potential_id
-                        break
-            
-            if order_id:
-                # TRACKING SHORT-CIRCUIT: Return tracking-specific response
-                return {
-                    "order_id": order_id,
-                    "issue": "tracking",  # Special tracking issue type
-                    "resolution": "tracking",  # Special tracking resolution type
-                    "is_complete": True,  # SHORT-CIRCUIT: Complete for tracking
-                    "is_tracking": True  # Flag for tracking flow
-                }
-        
-        # Only process if message contains clear support indicators (NOT tracking)
-        support_indicators = ["refund", "replacement", "cancel", "wrong", "damaged", "delayed", "broken", "return"]
-        if not any(indicator in message_lower for indicator in support_indicators):
-            return {
-                "order_id": None,
-                "issue": None,
-                "resolution": None,
-                "is_complete": False,
-                "is_tracking": False
-            }
-        
-        # 1. Extract order_id via regex patterns
-        order_id = None
-        order_patterns = [
-            r"order\s*#?\s*([A-Z0-9]{3,8})",  # order 12345 or order #ABC123
-            r"#([A-Z0-9]{3,8})",  # #12345
-            r"\b(\d{4,8})\b",  # 4-8 digit numbers as standalone words
-            r"\b([A-Z]{2,3}\d{4,6})\b"  # ABC1234 format
-        ]
-        
-        for pattern in order_patterns:
-            match = re.search(pattern, message, re.IGNORECASE)
-            if match:
-                potential_id = match.group(1)
-                # Validate it's not a common word and is actually numeric or alphanumeric ID
-                if (potential_id.lower() not in ["is", "my", "the", "and", "but", "got", "want", "need", "status", "arrive", "delivery", "order", "track", "where", "when", "will"] and
-                    (potential_id.isdigit() or (len(potential_id) >= 3 and any(c.isdigit() for c in potential_id)))):
-                    order_id = potential_id
-                    break
-        
-        # 2. Detect issue type - SIMPLIFIED (wrong item / delivery / refund / cancel)
-        issue = None
-        
-        # Wrong item detection
-        if any(keyword in message_lower for keyword in ["got wrong", "received wrong", "wrong item", "instead of", "but got", "sent wrong", "incorrect"]):
-            issue = "wrong_item"
-        
-        # Delivery issue detection  
-        elif any(keyword in message_lower for keyword in ["delayed", "late", "not arrived", "hasn't arrived", "delivery", "shipping"]):
-            issue = "delivery"
-        
-        # Damaged item detection
-        elif any(keyword in message_lower for keyword in ["damaged", "broken", "defective", "not working"]):
-            issue = "damaged"
-        
-        # 3. Detect resolution intent - EXPLICIT ONLY
-        resolution = None
-        
-        # Refund detection
-        if any(keyword in message_lower for keyword in ["refund", "money back", "want refund", "need refund"]):
-            resolution = "refund"
-        
-        # Replacement detection
-        elif any(keyword in message_lower for keyword in ["replacement", "replace", "new one", "send another"]):
-            resolution = "replacement"
-        
-        # Cancellation detection
-        elif any(keyword in message_lower for keyword in ["cancel", "cancellation", "cancel order"]):
-            resolution = "cancel"
-        
-        # 4. CRITICAL: Determine if request is COMPLETE
-        # For refund/replacement: need order_id + resolution (issue can be inferred)
-        # For cancel: need order_id + resolution only
-        if resolution in ["refund", "replacement"]:
-            # If no explicit issue but refund/replacement requested, infer general issue
-            if not issue and order_id and resolution:
-                issue = "general"
-            is_complete = bool(order_id and issue and resolution)
-        elif resolution == "cancel":
-            is_complete = bool(order_id and resolution)
-            issue = "cancel"  # Cancel is both issue and resolution
-        else:
-            is_complete = False
-        
-        return {
-            "order_id": order_id,
-            "issue": issue,
-            "resolution": resolution,
-            "is_complete": is_complete,
-            "is_tracking": False
-        }
+        # Fresh dict per call - callers may mutate the result
+        return dict(_detect_complete_request_cached(message, COMPLETE_REQUEST_DETECTOR_VERSION))
     
     def detect_conjunctions(self, message: str) -> List[str]:
         """
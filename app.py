@@ -6,10 +6,13 @@ from agents.human_conversation_manager import HumanConversationManager
 from memory.session_manager import SessionManager
 import time
 import os
+import functools
 from dotenv import load_dotenv
 import threading
 from pathlib import Path
 
+from data.order_id import extract_numeric_order_id
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -37,6 +40,10 @@ def initialize_tts_async():
     init_thread = threading.Thread(target=_init, daemon=True)
     init_thread.start()
 
+# Start loading the TTS model right away, so it overlaps with dataset
+# loading below instead of starting after it
+initialize_tts_async()
+
 # Store audio paths for serving
 audio_cache = {}
 
@@ -88,6 +95,10 @@ def load_datasets():
         
         faq_df = pd.DataFrame(faq_data)
         
+        # Lowercase and tokenize FAQ questions once here, not on every lookup
+        faq_df['_q_lower'] = faq_df['question'].astype(str).str.lower()
+        faq_df['_q_tokens'] = [frozenset(q.split()) for q in faq_df['_q_lower']]
+        
         print(f"✅ Datasets loaded successfully:")
         print(f"   📦 Orders: Loaded via data access layer")
         print(f"   ❓ FAQ entries: {len(faq_df)} records")
@@ -100,6 +111,28 @@ def load_datasets():
         # Return empty DataFrames as fallback
         return pd.DataFrame(), pd.DataFrame()
 
+# Keyword → FAQ domain routing used by get_faq_answer (first match wins)
+FAQ_DOMAIN_KEYWORDS = {
+    'Food Delivery': ['food', 'delivery', 'restaurant', 'meal', 'subscription'],
+    'E-commerce': ['order', 'product', 'shopping', 'purchase', 'coupon', 'discount'],
+    'General': ['support', 'help', 'contact', 'technical', 'app', 'issue', 'problem']
+}
+
+def build_faq_search_index(faq_df):
+    """
+    Partition the FAQ rows by domain once at startup.
+    Returns: dict of domain -> list of (row index, lowercased question, question
+    word set); the None key holds every row.
+    """
+    if faq_df.empty:
+        return {None: []}
+    
+    entries = list(zip(faq_df.index, faq_df['_q_lower'], faq_df['_q_tokens']))
+    search_index = {None: entries}
+    for entry, domain in zip(entries, faq_df['domain']):
+        search_index.setdefault(domain, []).append(entry)
+    return search_index
+
 # Legacy function - now delegates to data access layer
 def get_order_by_id_legacy(order_id):
     """
@@ -109,17 +142,12 @@ def get_order_by_id_legacy(order_id):
     try:
         # Convert input to integer (handles both int and str inputs)
         if isinstance(order_id, str):
-            # Extract numeric portion if it's a string like "ORD54582"
-            import re
-            match = re.search(r'(\d+)', order_id)
-            if match:
-                order_id_int = int(match.group(1))
-            else:
-                try:
-                    order_id_int = int(order_id)
-                except ValueError:
-                    print(f"❌ Invalid order ID format: {order_id}")
-                    return None
+            # Extract numeric portion if it's a string like "ORD54582"; a
+            # string without digits can never parse, so no int() retry
+            order_id_int = extract_numeric_order_id(order_id)
+            if order_id_int is None:
+                print(f"❌ Invalid order ID format: {order_id}")
+                return None
         elif isinstance(order_id, int):
             order_id_int = order_id
         else:
@@ -147,97 +175,100 @@ def get_faq_answer(user_question):
         str: FAQ answer if found, None if no match
     """
     try:
-        user_question_lower = user_question.lower().strip()
-        
-        print(f"🔍 {'Enhanced' if ENHANCED_MODE else 'Standard'} FAQ search for: '{user_question}'")
-        
-        # First, try the enhanced FAQ system using support tickets (if available)
-        if ENHANCED_MODE:
-            enhanced_answer = get_enhanced_faq_answer(user_question)
-            if enhanced_answer:
-                # Validate the enhanced answer quality
-                if _is_good_enhanced_answer(enhanced_answer):
-                    print(f"✅ Enhanced FAQ answer found from support tickets")
-                    return enhanced_answer
-                else:
-                    print(f"⚠️ Enhanced answer quality poor, using fallback")
-        
-        # Product-specific responses for common issues
-        product_response = _get_product_specific_response(user_question_lower)
-        if product_response:
-            return product_response
-        
-        # Fallback to original FAQ dataset with improved matching
-        domain_keywords = {
-            'Food Delivery': ['food', 'delivery', 'restaurant', 'meal', 'subscription'],
-            'E-commerce': ['order', 'product', 'shopping', 'purchase', 'coupon', 'discount'],
-            'General': ['support', 'help', 'contact', 'technical', 'app', 'issue', 'problem']
-        }
-        
-        # Find matching domain
-        matched_domain = None
-        for domain, keywords in domain_keywords.items():
-            if any(keyword in user_question_lower for keyword in keywords):
-                matched_domain = domain
-                break
-        
-        # Filter FAQs by domain if found
-        if matched_domain:
-            domain_faqs = faq_df[faq_df['domain'] == matched_domain]
-            print(f"🎯 Found {len(domain_faqs)} FAQs in domain: {matched_domain}")
-        else:
-            domain_faqs = faq_df
-            print(f"🔍 Searching all {len(faq_df)} FAQs")
-        
-        if domain_faqs.empty:
-            print("❌ No FAQs found in filtered domain")
-            domain_faqs = faq_df
-        
-        # Try to find the most relevant FAQ by matching question keywords
-        best_match = None
-        best_score = 0
-        
-        for _, faq in domain_faqs.iterrows():
-            faq_question = str(faq['question']).lower()
-            faq_answer = str(faq['answer'])
-            
-            # Count common words between user question and FAQ question
-            user_words = set(user_question_lower.split())
-            faq_words = set(faq_question.split())
-            common_words = len(user_words.intersection(faq_words))
-            
-            # Also check if user question contains key terms from FAQ
-            keyword_matches = sum(1 for word in user_words if word in faq_question)
-            
-            total_score = common_words + keyword_matches
-            
-            if total_score > best_score:
-                best_score = total_score
-                best_match = faq
-        
-        if best_match is not None and best_score > 0:
-            answer = best_match['answer']
-            question = best_match['question']
-            category = best_match['category']
-            print(f"✅ Original FAQ match found: '{question}' (category: {category}, score: {best_score})")
-            return answer
-        
-        # Enhanced fallback responses based on question patterns
-        if 'subscription' in user_question_lower and 'food' in user_question_lower:
-            return "For subscription-related issues with food delivery services, please contact our support team directly. We can help you manage your subscription, billing, or delivery preferences."
-        
-        if 'food' in user_question_lower and 'delivery' in user_question_lower:
-            return "For food delivery issues, please contact our support team. We can help with orders, delivery problems, payment issues, and food quality concerns."
-        
-        # Generic fallback for any unmatched query
-        return "I can help you with orders, returns, billing, delivery, and technical issues. Could you please provide more specific details about what you need assistance with?"
-        
+        # Lowercased and whitespace-collapsed so repeated wording hits the cache;
+        # errors are handled out here so a failed lookup is never memoized
+        return _get_faq_answer_cached(' '.join(user_question.lower().split()))
     except Exception as e:
         print(f"❌ Error in FAQ search for '{user_question}': {e}")
         import traceback
         traceback.print_exc()
         return None
 
+@functools.lru_cache(maxsize=4096)
+def _get_faq_answer_cached(user_question):
+    """Answer a normalized FAQ question, memoized per process"""
+    user_question_lower = user_question.lower().strip()
+    
+    print(f"🔍 {'Enhanced' if ENHANCED_MODE else 'Standard'} FAQ search for: '{user_question}'")
+    
+    # First, try the enhanced FAQ system using support tickets (if available)
+    if ENHANCED_MODE:
+        enhanced_answer = get_enhanced_faq_answer(user_question)
+        if enhanced_answer:
+            # Validate the enhanced answer quality
+            if _is_good_enhanced_answer(enhanced_answer):
+                print(f"✅ Enhanced FAQ answer found from support tickets")
+                return enhanced_answer
+            else:
+                print(f"⚠️ Enhanced answer quality poor, using fallback")
+    
+    # Product-specific responses for common issues
+    product_response = _get_product_specific_response(user_question_lower)
+    if product_response:
+        return product_response
+    
+    # Fallback to original FAQ dataset with improved matching
+    # Find matching domain
+    matched_domain = None
+    for domain, keywords in FAQ_DOMAIN_KEYWORDS.items():
+        if any(keyword in user_question_lower for keyword in keywords):
+            matched_domain = domain
+            break
+    
+    # Filter FAQs by domain if found (partitions prebuilt at startup)
+    if matched_domain:
+        domain_faqs = FAQ_SEARCH_INDEX.get(matched_domain, [])
+        print(f"🎯 Found {len(domain_faqs)} FAQs in domain: {matched_domain}")
+    else:
+        domain_faqs = FAQ_SEARCH_INDEX[None]
+        print(f"🔍 Searching all {len(faq_df)} FAQs")
+    
+    if not domain_faqs:
+        print("❌ No FAQs found in filtered domain")
+        domain_faqs = FAQ_SEARCH_INDEX[None]
+    
+    # Try to find the most relevant FAQ by matching question keywords
+    best_match = None
+    best_score = 0
+    user_words = set(user_question_lower.split())
+    # Each user word scores at most 2 (exact word + substring), so a row
+    # reaching this bound cannot be beaten by any later row
+    max_score = 2 * len(user_words)
+    
+    # Compare against the questions precomputed in load_datasets()
+    for faq_index, faq_question, faq_words in domain_faqs:
+        # Count common words between user question and FAQ question
+        common_words = len(user_words.intersection(faq_words))
+        
+        # Also check if user question contains key terms from FAQ
+        keyword_matches = sum(1 for word in user_words if word in faq_question)
+        
+        total_score = common_words + keyword_matches
+        
+        if total_score > best_score:
+            best_score = total_score
+            best_match = faq_index
+            if best_score == max_score:
+                break
+    
+    if best_match is not None and best_score > 0:
+        best_match = faq_df.loc[best_match]
+        answer = best_match['answer']
+        question = best_match['question']
+        category = best_match['category']
+        print(f"✅ Original FAQ match found: '{question}' (category: {category}, score: {best_score})")
+        return answer
+    
+    # Enhanced fallback responses based on question patterns
+    if 'subscription' in user_question_lower and 'food' in user_question_lower:
+        return "For subscription-related issues with food delivery services, please contact our support team directly. We can help you manage your subscription, billing, or delivery preferences."
+    
+    if 'food' in user_question_lower and 'delivery' in user_question_lower:
+        return "For food delivery issues, please contact our support team. We can help with orders, delivery problems, payment issues, and food quality concerns."
+    
+    # Generic fallback for any unmatched query
+    return "I can help you with orders, returns, billing, delivery, and technical issues. Could you please provide more specific details about what you need assistance with?"
+
 def _is_good_enhanced_answer(answer: str) -> bool:
     """Check if enhanced answer is of good quality"""
     if not answer or len(answer) < 20:
@@ -289,6 +320,7 @@ def _get_product_specific_response(question: str) -> Optional[str]:
 
 # Load datasets at startup
 orders_df, faq_df = load_datasets()
+FAQ_SEARCH_INDEX = build_faq_search_index(faq_df)
 
 # ============================================================================
 # DIALOGUE STATE MANAGEMENT
@@ -304,9 +336,6 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = 'dev-secret-key'
 socketio = SocketIO(app, cors_allowed_origins="*")
 
-# Initialize TTS engine in background
-initialize_tts_async()
-
 # Initialize components with human conversation flow
 STORAGE_TYPE = os.getenv('SESSION_STORAGE', 'json')
 STORAGE_PATH = os.getenv('SESSION_STORAGE_PATH', 'data/sessions')
@@ -559,7 +588,7 @@ def handle_get_session_info():
         'conversation_length': len(session.conversation_history),
         'communication_style': session.communication_style,
         'user_tone': session.user_tone,
-        'unresolved_issues': len([i for i in session.unresolved_issues if i.get('status') == 'open']),
+        'unresolved_issues': sum(1 for i in session.unresolved_issues if i.get('status') == 'open'),
         'storage_info': session_manager.get_storage_info()
     }
     
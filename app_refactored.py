@@ -17,14 +17,20 @@ import pandas as pd
 import json
 import re
 from typing import Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from enum import Enum
 from flask_socketio import SocketIO, emit
 from memory.session_manager import SessionManager
 import time
 import os
+import functools
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -32,15 +38,22 @@ load_dotenv()
 # DATASET LOADING - MANDATORY FOR ALL RESPONSES
 # ============================================================================
 
+@functools.lru_cache(maxsize=1)
 def load_datasets() -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Load datasets that drive ALL user-facing responses.
+    Parsed once per process - repeated calls return the cached DataFrames,
+    so callers must treat them as read-only.
     Returns: (orders_df, faq_df)
     """
     try:
-        # Load customer order dataset
-        with open('datasets/customer_order_dataset.json', 'r') as f:
-            orders_data = json.load(f)
+        # Load customer order dataset (orjson parses the raw bytes when available)
+        if orjson:
+            with open('datasets/customer_order_dataset.json', 'rb') as f:
+                orders_data = orjson.loads(f.read())
+        else:
+            with open('datasets/customer_order_dataset.json', 'r') as f:
+                orders_data = json.load(f)
         
         # Flatten orders for efficient querying
         flattened_orders = []
@@ -60,6 +73,14 @@ def load_datasets() -> Tuple[pd.DataFrame, pd.DataFrame]:
         
         orders_df = pd.DataFrame(flattened_orders)
         
+        # Dictionary-encode low-cardinality string columns to cut memory
+        orders_df = orders_df.astype({
+            'product': 'category',
+            'platform': 'category',
+            'status': 'category',
+            'payment_mode': 'category'
+        })
+        
         # Load FAQ dataset
         with open('datasets/ai_customer_support_data.json', 'r') as f:
             faq_data = json.load(f)
@@ -76,19 +97,34 @@ def load_datasets() -> Tuple[pd.DataFrame, pd.DataFrame]:
         print(f"❌ CRITICAL: Dataset loading failed: {e}")
         raise RuntimeError("Cannot start application without datasets")
 
+def build_order_index(orders_df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """
+    Build a hash index over the orders dataset, keyed by both the
+    "ORD54582" form and the bare numeric form "54582".
+    Each record also carries a preformatted 'amount_display' string.
+    """
+    order_index = {}
+    for record in orders_df.to_dict('records'):
+        # Rendered once here instead of on every billing response
+        record['amount_display'] = f"₹{record['amount']}"
+        order_key = str(record['order_id']).strip().upper()
+        order_index.setdefault(order_key, record)
+        if order_key.startswith('ORD'):
+            order_index.setdefault(order_key[3:], record)
+    return order_index
+
 def get_order_by_id(order_id: str) -> Optional[Dict[str, Any]]:
     """
     MANDATORY dataset query for order information.
     Every order-related response MUST use this function.
     """
     try:
-        order_id_str = str(order_id).strip()
-        matching_orders = orders_df[orders_df['order_id'].astype(str) == order_id_str]
+        order_key = str(order_id).strip().lstrip('#').upper()
+        order_details = ORDER_INDEX.get(order_key)
         
-        if not matching_orders.empty:
-            order_details = matching_orders.iloc[0].to_dict()
+        if order_details is not None:
             print(f"📊 DATASET QUERY: Found order {order_id}")
-            return order_details
+            return dict(order_details)
         else:
             print(f"📊 DATASET QUERY: Order {order_id} not found")
             return None
@@ -97,75 +133,78 @@ def get_order_by_id(order_id: str) -> Optional[Dict[str, Any]]:
         print(f"❌ Dataset query error for order {order_id}: {e}")
         return None
 
+# Rule-based category matching keywords for FAQ lookup
+FAQ_CATEGORY_KEYWORDS = {
+    'orders': ['order', 'track', 'tracking', 'purchase', 'buy', 'bought', 'placed'],
+    'returns & refunds': ['return', 'refund', 'exchange', 'money back', 'cancel'],
+    'billing': ['bill', 'payment', 'charge', 'invoice', 'cost', 'price', 'money', 'charged'],
+    'delivery': ['delivery', 'shipping', 'deliver', 'ship', 'arrive', 'when will'],
+    'account & login': ['account', 'login', 'password', 'sign in', 'register'],
+    'technical issues': ['error', 'bug', 'not working', 'broken', 'issue', 'problem'],
+    'general queries': ['help', 'support', 'question', 'how to', 'what is', 'contact'],
+    'offers & discounts': ['coupon', 'discount', 'offer', 'promo', 'code'],
+    'payments': ['payment', 'pay', 'failed', 'deducted']
+}
+
+def build_faq_index(faq_df: pd.DataFrame) -> Dict[str, list]:
+    """
+    Build a per-category index of (question word set, answer) pairs so
+    FAQ lookups never touch the DataFrame on the hot path.
+    """
+    faq_index = {}
+    for record in faq_df.to_dict('records'):
+        question_words = frozenset(record['question'].lower().split())
+        faq_index.setdefault(record['category'].lower(), []).append((question_words, record['answer']))
+    return faq_index
+
 def get_faq_answer(user_question: str) -> Optional[str]:
     """
     MANDATORY dataset query for FAQ responses.
     Every FAQ response MUST use this function.
     """
     try:
-        user_question_lower = user_question.lower().strip()
-        
-        # Rule-based category matching
-        category_keywords = {
-            'orders': ['order', 'track', 'tracking', 'purchase', 'buy', 'bought', 'placed'],
-            'returns & refunds': ['return', 'refund', 'exchange', 'money back', 'cancel'],
-            'billing': ['bill', 'payment', 'charge', 'invoice', 'cost', 'price', 'money', 'charged'],
-            'delivery': ['delivery', 'shipping', 'deliver', 'ship', 'arrive', 'when will'],
-            'account & login': ['account', 'login', 'password', 'sign in', 'register'],
-            'technical issues': ['error', 'bug', 'not working', 'broken', 'issue', 'problem'],
-            'general queries': ['help', 'support', 'question', 'how to', 'what is', 'contact'],
-            'offers & discounts': ['coupon', 'discount', 'offer', 'promo', 'code'],
-            'payments': ['payment', 'pay', 'failed', 'deducted']
-        }
-        
-        # Find best matching category
-        best_category = None
-        max_matches = 0
-        
-        for category, keywords in category_keywords.items():
-            matches = sum(1 for keyword in keywords if keyword in user_question_lower)
-            if matches > max_matches:
-                max_matches = matches
-                best_category = category
-        
-        if best_category and max_matches > 0:
-            # Query FAQ dataset
-            category_faqs = faq_df[faq_df['category'].str.lower() == best_category.lower()]
-            
-            if not category_faqs.empty:
-                # Find most relevant FAQ
-                best_match = None
-                best_score = 0
-                
-                for _, faq in category_faqs.iterrows():
-                    faq_question = faq['question'].lower()
-                    user_words = set(user_question_lower.split())
-                    faq_words = set(faq_question.split())
-                    common_words = len(user_words.intersection(faq_words))
-                    
-                    if common_words > best_score:
-                        best_score = common_words
-                        best_match = faq
-                
-                if best_match is not None:
-                    answer = best_match['answer']
-                    print(f"📊 DATASET QUERY: FAQ match for '{best_category}'")
-                    return answer
-                else:
-                    # Fallback to first FAQ in category
-                    answer = category_faqs.iloc[0]['answer']
-                    print(f"📊 DATASET QUERY: FAQ category fallback for '{best_category}'")
-                    return answer
-        
-        print(f"📊 DATASET QUERY: No FAQ match found")
-        return None
+        return _match_faq_answer(user_question.lower().strip())
         
     except Exception as e:
         print(f"❌ Dataset query error for FAQ: {e}")
         return None
 
+@functools.lru_cache(maxsize=1024)
+def _match_faq_answer(user_question_lower: str) -> Optional[str]:
+    """Match a normalized question against FAQ_INDEX, memoized per process"""
+    # Find best matching category
+    best_category = None
+    max_matches = 0
+    
+    for category, keywords in FAQ_CATEGORY_KEYWORDS.items():
+        matches = sum(1 for keyword in keywords if keyword in user_question_lower)
+        if matches > max_matches:
+            max_matches = matches
+            best_category = category
+    
+    if best_category and max_matches > 0:
+        # Query FAQ dataset
+        category_faqs = FAQ_INDEX.get(best_category)
+        
+        if category_faqs:
+            # Find most relevant FAQ - max() keeps the first best-scoring
+            # entry, which is also the category fallback when nothing overlaps
+            user_words = frozenset(user_question_lower.split())
+            best_words, best_answer = max(category_faqs, key=lambda faq: len(user_words & faq[0]))
+            
+            if not user_words.isdisjoint(best_words):
+                print(f"📊 DATASET QUERY: FAQ match for '{best_category}'")
+            else:
+                print(f"📊 DATASET QUERY: FAQ category fallback for '{best_category}'")
+            return best_answer
+    
+    print(f"📊 DATASET QUERY: No FAQ match found")
+    return None
+
 # Load datasets at startup - MANDATORY
 orders_df, faq_df = load_datasets()
+ORDER_INDEX = build_order_index(orders_df)
+FAQ_INDEX = build_faq_index(faq_df)
 
 # ============================================================================
 # SESSION STATE STRUCTURE - EXPLICIT DIALOGUE MANAGEMENT
@@ -197,10 +236,42 @@ class SessionState:
         self.context.clear()
         print("🔄 Session state reset - ready for new conversation")
 
+@dataclass(frozen=True)
+class RouterResponse:
+    """Immutable result of one routed message"""
+    response: str
+    conversation_state: str
+    data_source: str
+    order_data: Optional[Dict[str, Any]] = None
+    
+    # Mapping-style access kept for callers written against the old dict results,
+    # which only carried 'order_data' when an order was found
+    def __contains__(self, key: str) -> bool:
+        if key not in {f.name for f in fields(self)}:
+            return False
+        return key != 'order_data' or self.order_data is not None
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
 # ============================================================================
 # CENTRAL ROUTER - MANDATORY SINGLE CONTROLLER
 # ============================================================================
 
+# Order ID patterns, tried in priority order - compiled once at import
+ORDER_ID_PATTERNS = [
+    re.compile(r'\b(ORD\d+)\b', re.IGNORECASE),
+    re.compile(r'#(\d+)', re.IGNORECASE),
+    re.compile(r'order\s*#?\s*(ORD\d+)', re.IGNORECASE),
+    re.compile(r'order\s*#?\s*(\d{5,8})', re.IGNORECASE),
+    re.compile(r'\border\s+(\d{5,8})\b', re.IGNORECASE)
+]
+
 class ConversationRouter:
     """
     MANDATORY central controller that enforces the data flow:
@@ -224,7 +295,7 @@ class ConversationRouter:
             ]
         }
     
-    def handle_user_message(self, message: str, session) -> Dict[str, Any]:
+    def handle_user_message(self, message: str, session) -> RouterResponse:
         """
         MANDATORY CENTRAL CONTROLLER - enforces explicit data flow
         
@@ -277,16 +348,8 @@ class ConversationRouter:
     
     def _extract_order_id(self, message: str) -> Optional[str]:
         """Extract order ID using regex patterns"""
-        patterns = [
-            r'\b(ORD\d+)\b',
-            r'#(\d+)',
-            r'order\s*#?\s*(ORD\d+)',
-            r'order\s*#?\s*(\d{5,8})',
-            r'\border\s+(\d{5,8})\b'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, message, re.IGNORECASE)
+        for pattern in ORDER_ID_PATTERNS:
+            match = pattern.search(message)
             if match:
                 order_id = match.group(1)
                 if order_id.lower() not in ['is', 'my', 'the', 'and', 'number']:
@@ -295,7 +358,7 @@ class ConversationRouter:
         
         return None
     
-    def _handle_slot_filling(self, message: str, state: SessionState) -> Dict[str, Any]:
+    def _handle_slot_filling(self, message: str, state: SessionState) -> RouterResponse:
         """Handle slot filling for missing information"""
         
         if state.pending_slot == "order_id":
@@ -307,19 +370,19 @@ class ConversationRouter:
                 # Continue with workflow
                 return self._route_to_workflow(message, state)
             else:
-                return {
-                    'response': "I need your order number to help you. Please provide it in format like ORD12345 or #12345.",
-                    'conversation_state': 'awaiting_order_id',
-                    'data_source': 'slot_filling_prompt'
-                }
-        
-        return {
-            'response': "I didn't understand that. Could you please provide the information I requested?",
-            'conversation_state': 'slot_filling_error',
-            'data_source': 'error_handling'
-        }
+                return RouterResponse(
+                    response="I need your order number to help you. Please provide it in format like ORD12345 or #12345.",
+                    conversation_state='awaiting_order_id',
+                    data_source='slot_filling_prompt'
+                )
+        
+        return RouterResponse(
+            response="I didn't understand that. Could you please provide the information I requested?",
+            conversation_state='slot_filling_error',
+            data_source='error_handling'
+        )
     
-    def _route_to_workflow(self, message: str, state: SessionState) -> Dict[str, Any]:
+    def _route_to_workflow(self, message: str, state: SessionState) -> RouterResponse:
         """Route to intent-specific workflow handlers - ALL DATASET-DRIVEN"""
         
         intent = state.active_intent
@@ -333,7 +396,7 @@ class ConversationRouter:
         else:
             return self._handle_faq_workflow(message, state)
     
-    def _handle_billing_workflow(self, message: str, state: SessionState) -> Dict[str, Any]:
+    def _handle_billing_workflow(self, message: str, state: SessionState) -> RouterResponse:
         """DATASET-DRIVEN billing issue handler"""
         
         # Require order_id
@@ -343,11 +406,11 @@ class ConversationRouter:
                 state.context['order_id'] = order_id
             else:
                 state.pending_slot = "order_id"
-                return {
-                    'response': "I can help with billing issues. Please provide your order number so I can look into this.",
-                    'conversation_state': 'billing_awaiting_order',
-                    'data_source': 'workflow_prompt'
-                }
+                return RouterResponse(
+                    response="I can help with billing issues. Please provide your order number so I can look into this.",
+                    conversation_state='billing_awaiting_order',
+                    data_source='workflow_prompt'
+                )
         
         # MANDATORY dataset queries
         order_id = state.context['order_id']
@@ -355,7 +418,8 @@ class ConversationRouter:
         faq_answer = get_faq_answer("billing payment charge issue")  # DATASET QUERY
         
         if order_details:
-            response = f"I found your order #{order_id} for {order_details['product']} (₹{order_details['amount']}). "
+            amount_display = order_details.get('amount_display') or f"₹{order_details['amount']}"
+            response = f"I found your order #{order_id} for {order_details['product']} ({amount_display}). "
             
             if faq_answer:
                 response += faq_answer
@@ -365,21 +429,21 @@ class ConversationRouter:
             # Complete workflow
             state.reset()
             
-            return {
-                'response': response,
-                'conversation_state': 'billing_resolved',
-                'data_source': 'order_dataset + faq_dataset',
-                'order_data': order_details
-            }
+            return RouterResponse(
+                response=response,
+                conversation_state='billing_resolved',
+                data_source='order_dataset + faq_dataset',
+                order_data=order_details
+            )
         else:
             state.reset()
-            return {
-                'response': f"I couldn't find order #{order_id} in our system. Please check the order number and try again.",
-                'conversation_state': 'billing_order_not_found',
-                'data_source': 'order_dataset_negative'
-            }
+            return RouterResponse(
+                response=f"I couldn't find order #{order_id} in our system. Please check the order number and try again.",
+                conversation_state='billing_order_not_found',
+                data_source='order_dataset_negative'
+            )
     
-    def _handle_return_workflow(self, message: str, state: SessionState) -> Dict[str, Any]:
+    def _handle_return_workflow(self, message: str, state: SessionState) -> RouterResponse:
         """DATASET-DRIVEN return order handler"""
         
         # Require order_id
@@ -389,11 +453,11 @@ class ConversationRouter:
                 state.context['order_id'] = order_id
             else:
                 state.pending_slot = "order_id"
-                return {
-                    'response': "I can help you return your order. Please provide your order number to check return eligibility.",
-                    'conversation_state': 'return_awaiting_order',
-                    'data_source': 'workflow_prompt'
-                }
+                return RouterResponse(
+                    response="I can help you return your order. Please provide your order number to check return eligibility.",
+                    conversation_state='return_awaiting_order',
+                    data_source='workflow_prompt'
+                )
         
         # MANDATORY dataset query
         order_id = state.context['order_id']
@@ -417,21 +481,21 @@ class ConversationRouter:
             # Complete workflow
             state.reset()
             
-            return {
-                'response': response,
-                'conversation_state': 'return_processed',
-                'data_source': 'order_dataset',
-                'order_data': order_details
-            }
+            return RouterResponse(
+                response=response,
+                conversation_state='return_processed',
+                data_source='order_dataset',
+                order_data=order_details
+            )
         else:
             state.reset()
-            return {
-                'response': f"I couldn't find order #{order_id} in our system. Please check the order number and try again.",
-                'conversation_state': 'return_order_not_found',
-                'data_source': 'order_dataset_negative'
-            }
+            return RouterResponse(
+                response=f"I couldn't find order #{order_id} in our system. Please check the order number and try again.",
+                conversation_state='return_order_not_found',
+                data_source='order_dataset_negative'
+            )
     
-    def _handle_status_workflow(self, message: str, state: SessionState) -> Dict[str, Any]:
+    def _handle_status_workflow(self, message: str, state: SessionState) -> RouterResponse:
         """DATASET-DRIVEN order status handler"""
         
         # Require order_id
@@ -441,11 +505,11 @@ class ConversationRouter:
                 state.context['order_id'] = order_id
             else:
                 state.pending_slot = "order_id"
-                return {
-                    'response': "I can help you track your order. Please provide your order number to check the current status.",
-                    'conversation_state': 'status_awaiting_order',
-                    'data_source': 'workflow_prompt'
-                }
+                return RouterResponse(
+                    response="I can help you track your order. Please provide your order number to check the current status.",
+                    conversation_state='status_awaiting_order',
+                    data_source='workflow_prompt'
+                )
         
         # MANDATORY dataset query
         order_id = state.context['order_id']
@@ -474,21 +538,21 @@ class ConversationRouter:
             # Complete workflow
             state.reset()
             
-            return {
-                'response': response,
-                'conversation_state': 'status_provided',
-                'data_source': 'order_dataset',
-                'order_data': order_details
-            }
+            return RouterResponse(
+                response=response,
+                conversation_state='status_provided',
+                data_source='order_dataset',
+                order_data=order_details
+            )
         else:
             state.reset()
-            return {
-                'response': f"I couldn't find order #{order_id} in our system. Please check the order number and try again.",
-                'conversation_state': 'status_order_not_found',
-                'data_source': 'order_dataset_negative'
-            }
+            return RouterResponse(
+                response=f"I couldn't find order #{order_id} in our system. Please check the order number and try again.",
+                conversation_state='status_order_not_found',
+                data_source='order_dataset_negative'
+            )
     
-    def _handle_faq_workflow(self, message: str, state: SessionState) -> Dict[str, Any]:
+    def _handle_faq_workflow(self, message: str, state: SessionState) -> RouterResponse:
         """DATASET-DRIVEN FAQ handler"""
         
         # MANDATORY dataset query
@@ -509,24 +573,24 @@ class ConversationRouter:
         # Complete workflow
         state.reset()
         
-        return {
-            'response': response,
-            'conversation_state': 'faq_answered',
-            'data_source': data_source
-        }
+        return RouterResponse(
+            response=response,
+            conversation_state='faq_answered',
+            data_source=data_source
+        )
     
-    def _handle_no_intent_fallback(self, message: str) -> Dict[str, Any]:
+    def _handle_no_intent_fallback(self, message: str) -> RouterResponse:
         """Fallback when no intent is detected - still tries dataset first"""
         
         # Try FAQ dataset first
         faq_answer = get_faq_answer(message)  # DATASET QUERY
         
         if faq_answer:
-            return {
-                'response': faq_answer,
-                'conversation_state': 'faq_fallback',
-                'data_source': 'faq_dataset'
-            }
+            return RouterResponse(
+                response=faq_answer,
+                conversation_state='faq_fallback',
+                data_source='faq_dataset'
+            )
         
         # Generic help only as last resort
         response = ("I'm here to help! I can assist you with:\n"
@@ -536,11 +600,11 @@ class ConversationRouter:
                    "• General questions\n\n"
                    "What would you like help with today?")
         
-        return {
-            'response': response,
-            'conversation_state': 'generic_help',
-            'data_source': 'fallback_menu'
-        }
+        return RouterResponse(
+            response=response,
+            conversation_state='generic_help',
+            data_source='fallback_menu'
+        )
 
 # ============================================================================
 # FLASK APPLICATION SETUP
@@ -618,8 +682,8 @@ def handle_user_message(data):
             # Route through CENTRAL CONTROLLER - enforces dataset usage
             result = conversation_router.handle_user_message(message, session)
             
-            response_text = result.get('response', '')
-            data_source = result.get('data_source', 'unknown')
+            response_text = result.response
+            data_source = result.data_source or 'unknown'
             
             print(f"✅ Response generated from: {data_source}")
             print(f"🤖 Response: {response_text[:100]}...")
@@ -642,11 +706,11 @@ def handle_user_message(data):
                 response_text = "I'm sorry, I encountered an issue. Please try rephrasing your question."
                 data_source = 'emergency_fallback'
             
-            result = {
-                'response': response_text,
-                'conversation_state': 'error_recovery',
-                'data_source': data_source
-            }
+            result = RouterResponse(
+                response=response_text,
+                conversation_state='error_recovery',
+                data_source=data_source
+            )
         
         # ============================================================================
         # END MANDATORY DATA FLOW
@@ -657,9 +721,9 @@ def handle_user_message(data):
         
         # Emit response with data source tracking
         response_data = {
-            'message': result.get('response', 'I apologize, but I need more information to help you.'),
-            'conversation_state': result.get('conversation_state'),
-            'data_source': result.get('data_source', 'unknown')
+            'message': result.response or 'I apologize, but I need more information to help you.',
+            'conversation_state': result.conversation_state,
+            'data_source': result.data_source or 'unknown'
         }
         
         print(f"🤖 Sending response from: {response_data['data_source']}")
@@ -3,7 +3,18 @@ import json
 import pandas as pd
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-import re
+
+from data.order_id import extract_numeric_order_id
+
+try:
+    from pyarrow import csv as pa_csv
+except ImportError:
+    pa_csv = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 class EnhancedDataAccess:
     """
@@ -18,8 +29,10 @@ class EnhancedDataAccess:
         
         # Load all datasets
         self.orders_data = self._load_orders_json()
+        self._json_order_index = self._build_json_order_index()
         self.support_tickets = self._load_support_tickets_csv()
         self.india_orders = self._load_india_orders_excel()
+        self._dataset_stats = self._compute_dataset_stats()
         
         print(f"✅ Enhanced Data Access initialized:")
         print(f"   📦 JSON Orders: {len(self.orders_data)} customers")
@@ -30,19 +43,41 @@ class EnhancedDataAccess:
         """Load original customer order dataset"""
         try:
             json_path = self.base_path / "customer_order_dataset.json"
-            with open(json_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            if orjson:
+                data = orjson.loads(json_path.read_bytes())
+            else:
+                with open(json_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
             print(f"✅ Loaded JSON orders: {len(data)} customers")
             return data
         except Exception as e:
             print(f"❌ Error loading JSON orders: {e}")
             return []
     
+    def _build_json_order_index(self) -> Dict[int, tuple]:
+        """Map numeric order id -> (customer, order) over the JSON dataset (first wins)"""
+        index = {}
+        for customer in self.orders_data:
+            for order in customer.get("orders", []):
+                order_numeric_id = extract_numeric_order_id(order.get("order_id", ""))
+                if order_numeric_id is not None:
+                    index.setdefault(order_numeric_id, (customer, order))
+        return index
+    
     def _load_support_tickets_csv(self) -> pd.DataFrame:
         """Load customer support tickets CSV"""
         try:
             csv_path = self.base_path / "customer_support_tickets.csv"
-            df = pd.read_csv(csv_path)
+            
+            def read_source():
+                if pa_csv is not None:
+                    # Multithreaded Arrow parser; ticket descriptions contain quoted
+                    # newlines, which pandas' engine='pyarrow' cannot be told about
+                    parse_options = pa_csv.ParseOptions(newlines_in_values=True)
+                    return pa_csv.read_csv(csv_path, parse_options=parse_options).to_pandas()
+                return pd.read_csv(csv_path)
+            
+            df = self._load_with_parquet_cache(csv_path, read_source)
             print(f"✅ Loaded support tickets: {len(df)} tickets")
             return df
         except Exception as e:
@@ -53,13 +88,33 @@ class EnhancedDataAccess:
         """Load realistic India orders Excel"""
         try:
             excel_path = self.base_path / "realistic_customer_orders_india.xlsx"
-            df = pd.read_excel(excel_path)
+            df = self._load_with_parquet_cache(excel_path, lambda: pd.read_excel(excel_path))
             print(f"✅ Loaded India orders: {len(df)} orders")
             return df
         except Exception as e:
             print(f"❌ Error loading India orders: {e}")
             return pd.DataFrame()
     
+    def _load_with_parquet_cache(self, source_path: Path, read_source) -> pd.DataFrame:
+        """
+        Load a tabular dataset through a Parquet copy stored next to it.
+        The copy is (re)written from read_source() whenever it is missing or
+        older than the source; without pyarrow the source is read directly.
+        """
+        if pa_csv is None:
+            return read_source()
+        
+        cache_path = source_path.with_suffix('.parquet')
+        if cache_path.exists() and cache_path.stat().st_mtime >= source_path.stat().st_mtime:
+            return pd.read_parquet(cache_path, engine='pyarrow')
+        
+        df = read_source()
+        try:
+            df.to_parquet(cache_path, engine='pyarrow', index=False)
+        except Exception as e:
+            print(f"⚠️ Could not write Parquet cache {cache_path.name}: {e}")
+        return df
+    
     def get_customer_by_id(self, customer_id: str) -> Optional[Dict[str, Any]]:
         """
         Get comprehensive customer information by customer ID
@@ -191,21 +246,20 @@ class EnhancedDataAccess:
         return None
     
     def _search_json_orders(self, order_id: int) -> Optional[Dict[str, Any]]:
-        """Search in original JSON dataset"""
-        for customer in self.orders_data:
-            for order in customer.get("orders", []):
-                try:
-                    order_id_str = str(order.get("order_id", ""))
-                    match = re.search(r'(\d+)', order_id_str)
-                    if match and int(match.group(1)) == int(order_id):
-                        order_with_customer = order.copy()
-                        order_with_customer['customer_name'] = customer.get('name')
-                        order_with_customer['customer_id'] = customer.get('customer_id')
-                        print(f"✅ Found in JSON: {order_with_customer['product']} - {order_with_customer['status']}")
-                        return order_with_customer
-                except (ValueError, TypeError):
-                    continue
-        return None
+        """Search in original JSON dataset via the numeric order id index"""
+        try:
+            hit = self._json_order_index.get(int(order_id))
+        except (ValueError, TypeError):
+            return None
+        if hit is None:
+            return None
+        
+        customer, order = hit
+        order_with_customer = order.copy()
+        order_with_customer['customer_name'] = customer.get('name')
+        order_with_customer['customer_id'] = customer.get('customer_id')
+        print(f"✅ Found in JSON: {order_with_customer['product']} - {order_with_customer['status']}")
+        return order_with_customer
     
     def _search_india_orders(self, order_id: int) -> Optional[Dict[str, Any]]:
         """Search in India orders Excel dataset"""
@@ -369,7 +423,11 @@ class EnhancedDataAccess:
         return None
     
     def get_dataset_stats(self) -> Dict[str, Any]:
-        """Get comprehensive dataset statistics"""
+        """Get comprehensive dataset statistics (computed once at load time)"""
+        return self._dataset_stats
+    
+    def _compute_dataset_stats(self) -> Dict[str, Any]:
+        """Aggregate dataset statistics - the datasets are static after load"""
         return {
             'json_orders': {
                 'customers': len(self.orders_data),
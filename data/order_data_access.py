@@ -1,37 +1,65 @@
 # Main_EL_3/data/order_data_access.py
+import functools
 import json
+import os
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from data.order_id import extract_numeric_order_id
+
 DATASET_PATH = Path(__file__).resolve().parent.parent / "datasets" / "customer_order_dataset.json"
 
+# Per-lookup trace output, off unless ORDER_LOOKUP_DEBUG=1
+ORDER_LOOKUP_DEBUG = os.getenv('ORDER_LOOKUP_DEBUG') == '1'
+
 print(f"🔍 Loading dataset from: {DATASET_PATH}")
 
-with open(DATASET_PATH, "r", encoding="utf-8") as f:
-    ORDERS = json.load(f)
+@functools.lru_cache(maxsize=1)
+def load_orders():
+    """Parse the customer order dataset once per process and share it"""
+    if orjson:
+        # orjson decodes straight from bytes, no text-mode UTF-8 pass
+        return orjson.loads(DATASET_PATH.read_bytes())
+    with open(DATASET_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+ORDERS = load_orders()
 
 print(f"✅ Dataset loaded: {len(ORDERS)} customers")
 
+def build_order_index(customers):
+    """Map numeric order id -> (customer, order); first occurrence wins"""
+    index = {}
+    for customer in customers:
+        for order in customer.get("orders", []):
+            # Extract numeric portion from order_id (e.g., "ORD54582" -> 54582)
+            order_numeric_id = extract_numeric_order_id(order.get("order_id", ""))
+            if order_numeric_id is not None:
+                index.setdefault(order_numeric_id, (customer, order))
+    return index
+
+ORDER_INDEX = build_order_index(ORDERS)
+
 def get_order_by_id(order_id: int):
-    print(f"🔍 Looking up order ID: {order_id}")
+    if ORDER_LOOKUP_DEBUG:
+        print(f"🔍 Looking up order ID: {order_id}")
     
-    for customer in ORDERS:
-        for order in customer.get("orders", []):
-            try:
-                # Extract numeric portion from order_id (e.g., "ORD54582" -> 54582)
-                order_id_str = str(order.get("order_id", ""))
-                import re
-                match = re.search(r'(\d+)', order_id_str)
-                if match:
-                    order_numeric_id = int(match.group(1))
-                    if order_numeric_id == int(order_id):
-                        # Add customer info to the order
-                        order_with_customer = order.copy()
-                        order_with_customer['customer_name'] = customer.get('name')
-                        order_with_customer['customer_id'] = customer.get('customer_id')
-                        print(f"✅ Found order {order_id}: {order_with_customer['product']} - {order_with_customer['status']}")
-                        return order_with_customer
-            except (ValueError, TypeError):
-                continue
+    # Accepts 54582, "54582", "ORD54582", "#54582", "order 54582"
+    entry = ORDER_INDEX.get(extract_numeric_order_id(order_id))
+    if entry is None:
+        if ORDER_LOOKUP_DEBUG:
+            print(f"❌ Order {order_id} not found in dataset")
+        return None
     
-    print(f"❌ Order {order_id} not found in dataset")
-    return None
\ No newline at end of file
+    customer, order = entry
+    # Add customer info to the order
+    order_with_customer = order.copy()
+    order_with_customer['customer_name'] = customer.get('name')
+    order_with_customer['customer_id'] = customer.get('customer_id')
+    if ORDER_LOOKUP_DEBUG:
+        print(f"✅ Found order {order_id}: {order_with_customer['product']} - {order_with_customer['status']}")
+    return order_with_customer
@@ -0,0 +1,19 @@
+# Main_EL_3/data/order_id.py
+# Shared order id normalization: "ORD54582", "#54582", "order 54582" -> 54582
+import re
+
+ORDER_ID_RE = re.compile(r'(\d+)')
+
+def extract_numeric_order_id(order_id):
+    """Return the first numeric run of an order id as int, or None"""
+    match = ORDER_ID_RE.search(str(order_id))
+    return int(match.group(1)) if match else None
+
+def extract_numeric_order_ids(series):
+    """Vectorized extract_numeric_order_id for a pandas Series (nullable Int64)"""
+    import pandas as pd
+
+    return pd.to_numeric(
+        series.astype(str).str.extract(ORDER_ID_RE, expand=False),
+        errors='coerce'
+    ).astype('Int64')
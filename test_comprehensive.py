@@ -3,9 +3,14 @@
 Comprehensive test to ensure the tracking fix doesn't break other functionality
 """
 
+import re
+
 from agents.router_agent import RouterAgent
 from memory.session_manager import SessionMemory
 
+# Any digit in a response, matched in one C-level scan
+_DIGIT_RE = re.compile(r"\d")
+
 def test_comprehensive():
     """Test that tracking fix works and doesn't break other functionality"""
     
@@ -60,7 +65,7 @@ def test_comprehensive():
                 if "TRACKING" in category:
                     has_tracking_info = any(word in response.lower() for word in ["shipped", "processing", "delivered", "on the way"])
                     has_resolution_prompt = any(phrase in response.lower() for phrase in ["refund", "replacement", "how would you like"])
-                    has_order_id = "#" in response and any(char.isdigit() for char in response)
+                    has_order_id = "#" in response and _DIGIT_RE.search(response) is not None
                     
                     if has_tracking_info and not has_resolution_prompt and has_order_id:
                         print("✅ TRACKING SUCCESS")
@@ -69,7 +74,7 @@ def test_comprehensive():
                         
                 elif "RESOLUTION" in category:
                     has_resolution_info = any(word in response.lower() for word in ["refund", "cancel", "replacement", "return", "processed"])
-                    has_order_id = "#" in response and any(char.isdigit() for char in response)
+                    has_order_id = "#" in response and _DIGIT_RE.search(response) is not None
                     
                     if has_resolution_info and has_order_id:
                         print("✅ RESOLUTION SUCCESS")
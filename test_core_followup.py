@@ -6,6 +6,10 @@ Test the core follow-up functionality as specified in requirements
 from agents.human_conversation_manager import HumanConversationManager
 from memory.session_manager import SessionManager
 import os
+import re
+
+# Greeting-fallback phrases, matched case-insensitively in a single pass
+GREETING_RE = re.compile(r"hello|i'?m kiro|how can i help", re.IGNORECASE)
 
 def test_core_followup_requirements():
     """Test the exact requirements from the bug report"""
@@ -79,7 +83,7 @@ def test_core_followup_requirements():
                 # Core validation checks
                 checks = {
                     "Contains expected content": all(content in response for content in expected_contains),
-                    "No greeting fallback": not any(phrase in response.lower() for phrase in ["hello", "i'm kiro", "how can i help"]),
+                    "No greeting fallback": not GREETING_RE.search(response),
                     "No order ID request": "order number" not in response.lower() or "provide" not in response.lower(),
                     "References order": any("#" in content for content in expected_contains) and any(content in response for content in expected_contains if "#" in content)
                 }
@@ -141,7 +145,7 @@ def test_core_followup_requirements():
     print(f"   ✅ Order context preserved: {order_preserved}")
     
     print("\n4. Testing no greeting fallback...")
-    no_greeting = not any(phrase in result2.get('response', '').lower() for phrase in ["hello", "i'm kiro", "how can i help"])
+    no_greeting = not GREETING_RE.search(result2.get('response', ''))
     print(f"   ✅ No greeting fallback: {no_greeting}")
     
     core_requirements_met = memory_persisted and followup_detected and order_preserved and no_greeting
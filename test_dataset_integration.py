@@ -5,11 +5,15 @@ Test the complete dataset integration with OrderAgent
 
 import sys
 import os
+import re
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from data.order_data_access import get_order_by_id, get_order_data_access
 from agents.order_agent import OrderAgent
 
+# Numeric order-number extraction, compiled once for all test cases
+DIGIT_RE = re.compile(r'\d+')
+
 def test_data_access_layer():
     """Test the data access layer functionality"""
     print("🧪 TESTING DATA ACCESS LAYER")
@@ -70,6 +74,8 @@ def test_order_agent_integration():
     
     # Mock context for testing
     class MockSessionMemory:
+        __slots__ = ('active_order_id',)
+        
         def __init__(self):
             self.active_order_id = None
         
@@ -103,12 +109,9 @@ def test_order_agent_integration():
         
         try:
             # Add order number to detected entities for this test
-            if any(char.isdigit() for char in message):
-                import re
-                match = re.search(r'(\d+)', message)
-                if match:
-                    order_num = match.group(1)
-                    mock_context["detected_entities"] = {"order_number": [order_num]}
+            match = DIGIT_RE.search(message)
+            if match:
+                mock_context["detected_entities"] = {"order_number": [match.group()]}
             
             response = order_agent.process(message, mock_context)
             print(f"Response: {response[:100]}...")
@@ -144,6 +147,8 @@ def test_no_placeholder_responses():
     
     # Mock context
     class MockSessionMemory:
+        __slots__ = ('active_order_id',)
+        
         def __init__(self):
             self.active_order_id = None
         
@@ -5,9 +5,9 @@ Test dataset normalization and integer-to-integer order lookups
 
 import sys
 import os
-import pandas as pd
-import json
-import re
+
+from data.order_data_access import load_orders
+from data.order_id import extract_numeric_order_id, extract_numeric_order_ids
 
 def load_and_normalize_datasets():
     """Test the dataset loading and normalization logic"""
@@ -15,45 +15,34 @@ def load_and_normalize_datasets():
     print("=" * 50)
     
     try:
-        # Load customer order dataset
-        with open('datasets/customer_order_dataset.json', 'r') as f:
-            orders_data = json.load(f)
+        # pandas is only needed to build the normalized frame
+        import pandas as pd
+        
+        # Load customer order dataset (parsed once, shared with other tests)
+        orders_data = load_orders()
         
-        # Flatten the orders data
-        flattened_orders = []
-        for customer in orders_data:
-            for order in customer['orders']:
-                order_record = {
-                    'customer_id': customer['customer_id'],
-                    'customer_name': customer['name'],
-                    'order_id': order['order_id'],
-                    'product': order['product'],
-                    'platform': order['platform'],
-                    'status': order['status'],
-                    'payment_mode': order['payment_mode'],
-                    'amount': order['amount']
-                }
-                flattened_orders.append(order_record)
+        # Flatten the orders data - one row per order with its customer fields
+        orders_df = pd.json_normalize(orders_data, record_path='orders', meta=['customer_id', 'name'])
+        orders_df = orders_df.rename(columns={'name': 'customer_name'}).reindex(columns=[
+            'customer_id', 'customer_name', 'order_id', 'product',
+            'platform', 'status', 'payment_mode', 'amount'
+        ])
         
-        orders_df = pd.DataFrame(flattened_orders)
+        # Repetitive string columns stored as int-coded categories
+        orders_df = orders_df.astype({
+            'customer_name': 'category',
+            'product': 'category',
+            'platform': 'category',
+            'status': 'category',
+            'payment_mode': 'category'
+        })
         
         print(f"📊 Original dataset: {len(orders_df)} orders")
         print(f"📋 Sample order_ids: {orders_df['order_id'].head().tolist()}")
         
-        # Normalize order_id column to integer
-        def extract_numeric_order_id(order_id_str):
-            """Extract numeric portion from order_id"""
-            match = re.search(r'(\d+)', str(order_id_str))
-            if match:
-                return int(match.group(1))
-            else:
-                try:
-                    return int(order_id_str)
-                except (ValueError, TypeError):
-                    return None
-        
-        # Add normalized integer order_id column
-        orders_df['order_id_normalized'] = orders_df['order_id'].apply(extract_numeric_order_id)
+        # Add normalized integer order_id column - one vectorized regex pass
+        # over the whole column; nullable Int64 keeps failed ids as <NA>
+        orders_df['order_id_normalized'] = extract_numeric_order_ids(orders_df['order_id'])
         
         # Check normalization results
         print(f"🔢 Normalized order_ids: {orders_df['order_id_normalized'].head().tolist()}")
@@ -61,10 +50,12 @@ def load_and_normalize_datasets():
         print(f"   Original order_id: {orders_df['order_id'].dtype}")
         print(f"   Normalized order_id: {orders_df['order_id_normalized'].dtype}")
         
-        # Remove any rows where normalization failed
+        # Remove any rows where normalization failed - slice only when some
+        # did, so the usual all-valid case keeps the frame without a copy
         initial_count = len(orders_df)
-        orders_df = orders_df.dropna(subset=['order_id_normalized'])
-        orders_df['order_id_normalized'] = orders_df['order_id_normalized'].astype(int)
+        valid_mask = orders_df['order_id_normalized'].notna().to_numpy()
+        if not valid_mask.all():
+            orders_df = orders_df.loc[valid_mask]
         final_count = len(orders_df)
         
         print(f"✅ Normalization complete: {final_count}/{initial_count} orders processed")
@@ -80,30 +71,7 @@ def test_integer_lookups(orders_df):
     print("\n🔍 TESTING INTEGER-TO-INTEGER LOOKUPS")
     print("=" * 50)
     
-    def lookup_order_by_id(order_id, orders_df):
-        """Test lookup function with integer comparison"""
-        try:
-            # Convert input to integer
-            if isinstance(order_id, str):
-                match = re.search(r'(\d+)', order_id)
-                if match:
-                    order_id_int = int(match.group(1))
-                else:
-                    order_id_int = int(order_id)
-            else:
-                order_id_int = order_id
-            
-            # Integer-to-integer comparison
-            matching_orders = orders_df[orders_df['order_id_normalized'] == order_id_int]
-            
-            if not matching_orders.empty:
-                return matching_orders.iloc[0].to_dict()
-            else:
-                return None
-                
-        except Exception as e:
-            print(f"❌ Lookup error: {e}")
-            return None
+    import pandas as pd
     
     # Test cases
     test_cases = [
@@ -121,10 +89,14 @@ def test_integer_lookups(orders_df):
     
     success_count = 0
     
-    for test_input, description in test_cases:
+    # Parse every input in one vectorized pass and resolve them all with a
+    # single hashed isin against the normalized column
+    parsed_ids = extract_numeric_order_ids(pd.Series([str(test_input) for test_input, _ in test_cases]))
+    found_mask = parsed_ids.isin(orders_df['order_id_normalized']).to_numpy()
+    
+    for (test_input, description), found in zip(test_cases, found_mask):
         try:
-            result = lookup_order_by_id(test_input, orders_df)
-            found = result is not None
+            found = bool(found)
             
             if test_input in ["54582", 54582, "ORD54582", "#54582", "order 54582"]:
                 # These should all find the same order
@@ -161,30 +133,18 @@ def test_type_consistency():
     print("\n🔢 TESTING TYPE CONSISTENCY")
     print("=" * 50)
     
-    # Sample data
-    sample_data = {
-        'order_id': ['ORD12345', 'ORD67890', 'ORD11111'],
-        'product': ['Product A', 'Product B', 'Product C']
-    }
-    
-    df = pd.DataFrame(sample_data)
+    # Sample data - plain lists, no DataFrame needed for an id comparison
+    sample_order_ids = ['ORD12345', 'ORD67890', 'ORD11111']
     
     # Apply normalization
-    def extract_numeric_order_id(order_id_str):
-        match = re.search(r'(\d+)', str(order_id_str))
-        return int(match.group(1)) if match else None
-    
-    df['order_id_normalized'] = df['order_id'].apply(extract_numeric_order_id)
-    df['order_id_normalized'] = df['order_id_normalized'].astype(int)
+    normalized_ids = [extract_numeric_order_id(order_id) for order_id in sample_order_ids]
     
-    print(f"Original types: {df['order_id'].dtype}")
-    print(f"Normalized types: {df['order_id_normalized'].dtype}")
+    print(f"Original types: {type(sample_order_ids[0]).__name__}")
+    print(f"Normalized types: {type(normalized_ids[0]).__name__}")
     
     # Test lookup
     lookup_id = 12345
-    result = df[df['order_id_normalized'] == lookup_id]
-    
-    found = not result.empty
+    found = lookup_id in normalized_ids
     print(f"Lookup {lookup_id} (int) in normalized column: {'✅ FOUND' if found else '❌ NOT FOUND'}")
     
     return found
@@ -57,14 +57,14 @@ def test_datasets():
     # Show sample data
     print(f"\n📋 SAMPLE ORDER DATA:")
     sample_orders = orders_df.head(3)
-    for _, order in sample_orders.iterrows():
-        print(f"   {order['order_id']}: {order['customer_name']} - {order['product']} ({order['status']})")
+    for order in sample_orders.itertuples(index=False):
+        print(f"   {order.order_id}: {order.customer_name} - {order.product} ({order.status})")
     
     print(f"\n📋 SAMPLE FAQ DATA:")
     sample_faqs = faq_df.head(3)
-    for _, faq in sample_faqs.iterrows():
-        print(f"   Q: {faq['question']}")
-        print(f"   A: {faq['answer'][:80]}...")
+    for faq in sample_faqs.itertuples(index=False):
+        print(f"   Q: {faq.question}")
+        print(f"   A: {faq.answer[:80]}...")
         print()
     
     print("=" * 60)
@@ -121,8 +121,10 @@ def test_intent_detection():
         ("Random message", "faq")
     ]
     
-    for message, expected in test_messages:
-        detected = dialogue_manager._detect_intent(message)
+    # Classify every test message in one batched call
+    detected_intents = dialogue_manager.detect_intents_batch([message for message, _ in test_messages])
+    
+    for (message, expected), detected in zip(test_messages, detected_intents):
         status = "✅" if str(detected).split('.')[-1].lower() == expected else "❌"
         print(f"{status} '{message}' → {detected} (expected: {expected})")
 
@@ -3,47 +3,34 @@
 Test the data access function directly
 """
 
-import json
-from pathlib import Path
+from data.order_data_access import DATASET_PATH, load_orders
+from data.order_id import extract_numeric_order_id
 
 # Test the exact same code as in order_data_access.py
-DATASET_PATH = Path(__file__).resolve().parent / "datasets" / "customer_order_dataset.json"
-
 print(f"Dataset path: {DATASET_PATH}")
 print(f"File exists: {DATASET_PATH.exists()}")
 
 try:
-    with open(DATASET_PATH, "r", encoding="utf-8") as f:
-        ORDERS = json.load(f)
+    # Index every order by its numeric id ("ORD54582" -> 54582) over the
+    # dataset parsed once by load_orders()
+    ORDER_INDEX = {}
+    customers = load_orders()
+    customer_count = len(customers)
+    for customer in customers:
+        for order in customer.get("orders", []):
+            order_numeric_id = extract_numeric_order_id(order.get("order_id", ""))
+            if order_numeric_id is not None:
+                # Add customer info to the order
+                order_with_customer = dict(order)
+                order_with_customer['customer_name'] = customer.get('name')
+                order_with_customer['customer_id'] = customer.get('customer_id')
+                ORDER_INDEX.setdefault(order_numeric_id, order_with_customer)
     
-    print(f"Loaded {len(ORDERS)} customers")
+    print(f"Loaded {customer_count} customers")
+    print(f"Indexed {len(ORDER_INDEX)} orders")
     
     def get_order_by_id(order_id: int):
-        print(f"Looking for order ID: {order_id}")
-        for customer in ORDERS:
-            print(f"  Checking customer: {customer.get('name')}")
-            for order in customer.get("orders", []):
-                print(f"    Checking order: {order.get('order_id')}")
-                try:
-                    # Extract numeric portion from order_id (e.g., "ORD54582" -> 54582)
-                    order_id_str = str(order.get("order_id", ""))
-                    import re
-                    match = re.search(r'(\d+)', order_id_str)
-                    if match:
-                        order_numeric_id = int(match.group(1))
-                        print(f"      Extracted numeric ID: {order_numeric_id}")
-                        if order_numeric_id == int(order_id):
-                            print(f"      MATCH FOUND!")
-                            # Add customer info to the order
-                            order_with_customer = order.copy()
-                            order_with_customer['customer_name'] = customer.get('name')
-                            order_with_customer['customer_id'] = customer.get('customer_id')
-                            return order_with_customer
-                except (ValueError, TypeError) as e:
-                    print(f"      Error: {e}")
-                    continue
-        print("  No match found")
-        return None
+        return ORDER_INDEX.get(int(order_id))
     
     # Test with actual order IDs
     test_ids = [54582, 63640, 89, 654]
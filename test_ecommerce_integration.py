@@ -5,44 +5,83 @@ Test script to verify e-commerce page integration
 
 import requests
 import time
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from lxml import html as lxml_html
+    from lxml.cssselect import CSSSelector
+except ImportError:
+    lxml_html = None
+    from bs4 import BeautifulSoup
+
+BASE_URL = "http://localhost:5000"
+
+# Key elements of the e-commerce page as CSS selectors
+PAGE_CHECKS = [
+    ("Shop at RVCE title", "title"),
+    ("Header", "header.header"),
+    ("Navigation", "nav.navigation"),
+    ("Hero banner", "section.hero-banner"),
+    ("Categories section", "section.categories-section"),
+    ("Products section", "section.products-section"),
+    ("Chat widget", "div.chat-widget"),
+    ("Chat button", "div#chatButton"),
+    ("Chat panel", "div#chatPanel"),
+    ("E-commerce CSS", 'link[href*="ecommerce_simple.css"]'),
+    ("E-commerce JS", 'script[src*="ecommerce_simple.js"]'),
+    ("Socket.IO", 'script[src*="socket.io"]'),
+]
+
+# Selectors compiled once to XPath when lxml is available
+COMPILED_CHECKS = [(name, CSSSelector(selector)) for name, selector in PAGE_CHECKS] if lxml_html else None
+
+def find_page_elements(content):
+    """Return (name, found) for every PAGE_CHECKS entry"""
+    if lxml_html:
+        tree = lxml_html.fromstring(content)
+        return [(name, bool(selector(tree))) for name, selector in COMPILED_CHECKS]
+    
+    soup = BeautifulSoup(content, 'html.parser')
+    return [(name, soup.select_one(selector) is not None) for name, selector in PAGE_CHECKS]
+
+# One keep-alive session shared by every request in this script
+SESSION = requests.Session()
+
+def fetch_all(paths):
+    """GET every path concurrently over the shared session, in input order"""
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        return list(executor.map(lambda path: SESSION.get(f"{BASE_URL}{path}"), paths))
+
+def wait_for_server(timeout=10.0, interval=0.1):
+    """Poll the main page until the server answers 200 OK or timeout expires"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if SESSION.get(f"{BASE_URL}/").status_code == 200:
+                return True
+        except requests.exceptions.ConnectionError:
+            pass
+        time.sleep(interval)
+    return False
 
 def test_ecommerce_page():
     """Test that the e-commerce page loads correctly"""
     try:
         print("🧪 Testing e-commerce page integration...")
         
-        # Test main page
-        response = requests.get("http://localhost:5000/")
-        print(f"✅ Main page status: {response.status_code}")
-        
-        # Test e-commerce page
-        response = requests.get("http://localhost:5000/ecommerce")
+        # Test main page and e-commerce page together
+        main_response, response = fetch_all(["/", "/ecommerce"])
+        print(f"✅ Main page status: {main_response.status_code}")
         print(f"✅ E-commerce page status: {response.status_code}")
         
         if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
             # Check for key elements
-            checks = [
-                ("Shop at RVCE title", soup.find('title')),
-                ("Header", soup.find('header', class_='header')),
-                ("Navigation", soup.find('nav', class_='navigation')),
-                ("Hero banner", soup.find('section', class_='hero-banner')),
-                ("Categories section", soup.find('section', class_='categories-section')),
-                ("Products section", soup.find('section', class_='products-section')),
-                ("Chat widget", soup.find('div', class_='chat-widget')),
-                ("Chat button", soup.find('div', id='chatButton')),
-                ("Chat panel", soup.find('div', id='chatPanel')),
-                ("E-commerce CSS", soup.find('link', href=lambda x: x and 'ecommerce_simple.css' in x)),
-                ("E-commerce JS", soup.find('script', src=lambda x: x and 'ecommerce_simple.js' in x)),
-                ("Socket.IO", soup.find('script', src=lambda x: x and 'socket.io' in x)),
-            ]
+            checks = find_page_elements(response.content)
             
             print("\n🔍 Element checks:")
             all_passed = True
-            for name, element in checks:
-                if element:
+            for name, found in checks:
+                if found:
                     print(f"  ✅ {name}: Found")
                 else:
                     print(f"  ❌ {name}: Missing")
@@ -77,8 +116,7 @@ def test_static_files():
             "/static/chat.js"
         ]
         
-        for file_path in static_files:
-            response = requests.get(f"http://localhost:5000{file_path}")
+        for file_path, response in zip(static_files, fetch_all(static_files)):
             if response.status_code == 200:
                 print(f"  ✅ {file_path}: Available")
             else:
@@ -91,8 +129,8 @@ if __name__ == "__main__":
     print("🚀 Starting E-commerce Integration Tests")
     print("=" * 50)
     
-    # Wait a moment for server to be ready
-    time.sleep(2)
+    # Wait until the server is ready instead of sleeping a fixed time
+    wait_for_server()
     
     success = test_ecommerce_page()
     test_static_files()
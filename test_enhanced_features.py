@@ -4,9 +4,10 @@ Test script to demonstrate the enhanced multi-turn conversation capabilities
 of the Kiro AI Assistant with session memory and entity tracking.
 """
 
-from agents.router_agent import RouterAgent
-from memory.session_manager import SessionManager
-import time
+from test_helpers import get_router, get_session_manager
+
+# Spaces and hyphens -> underscores in one str.translate call
+_SLUG_TABLE = str.maketrans(" -", "__")
 
 def test_enhanced_conversation_flow():
     """Test the enhanced conversation flow with session memory and context awareness"""
@@ -15,10 +16,8 @@ def test_enhanced_conversation_flow():
     print("=" * 60)
     
     # Initialize components
-    router = RouterAgent()
-    session_manager = SessionManager()
-    session_id = "test_session_001"
-    session = session_manager.get_session(session_id)
+    router = get_router()
+    session_manager = get_session_manager()
     
     # Test scenarios with enhanced context awareness
     test_scenarios = [
@@ -72,7 +71,7 @@ def test_enhanced_conversation_flow():
         print("-" * 50)
         
         # Create a new session for each scenario
-        session_id = f"test_{scenario['name'].lower().replace(' ', '_').replace('-', '_')}"
+        session_id = f"test_{scenario['name'].lower().translate(_SLUG_TABLE)}"
         session = session_manager.get_session(session_id)
         
         for i, message in enumerate(scenario['messages']):
@@ -96,8 +95,6 @@ def test_enhanced_conversation_flow():
                 print(f"   Detected Intents: {response_data['intents']}")
                 print(f"   Agents Used: {response_data['agents_used']}")
                 print(f"   Multi-Intent: {response_data['is_multi_intent']}")
-            
-            time.sleep(0.3)  # Small delay for readability
     
     print(f"\n✅ Enhanced Testing Complete!")
     print(f"📈 Total Sessions Created: {session_manager.get_session_count()}")
@@ -108,8 +105,8 @@ def test_context_aware_responses():
     print("\n🧠 Testing Context-Aware Response Generation")
     print("=" * 60)
     
-    router = RouterAgent()
-    session_manager = SessionManager()
+    router = get_router()
+    session_manager = get_session_manager()
     session = session_manager.get_session("context_test")
     
     # Simulate a conversation with context building
@@ -138,8 +135,8 @@ def test_multi_intent_detection():
     print("\n🔀 Testing Multi-Intent Detection and Response Merging")
     print("=" * 60)
     
-    router = RouterAgent()
-    session_manager = SessionManager()
+    router = get_router()
+    session_manager = get_session_manager()
     
     multi_intent_messages = [
         "I want a refund and my delivery is delayed",
@@ -3,6 +3,7 @@
 Test the enhanced dataset integration
 """
 
+import importlib.util
 import sys
 import os
 
@@ -10,19 +11,13 @@ def test_basic_imports():
     """Test if basic imports work"""
     print("🧪 Testing basic imports...")
     
-    try:
-        import pandas as pd
-        print("✅ pandas imported successfully")
-    except ImportError as e:
-        print(f"❌ pandas import failed: {e}")
-        return False
-    
-    try:
-        import openpyxl
-        print("✅ openpyxl imported successfully")
-    except ImportError as e:
-        print(f"❌ openpyxl import failed: {e}")
-        return False
+    # Probe with find_spec so the heavy packages are only imported when
+    # test_enhanced_data_access actually needs them
+    for module_name in ("pandas", "openpyxl"):
+        if importlib.util.find_spec(module_name) is None:
+            print(f"❌ {module_name} import failed: No module named '{module_name}'")
+            return False
+        print(f"✅ {module_name} available")
     
     return True
 
@@ -8,19 +8,23 @@ Comprehensive test script for the enhanced Kiro AI Assistant with:
 - Human-like conversation flow
 """
 
-from agents.router_agent import RouterAgent
 from memory.session_manager import SessionManager
+from test_helpers import get_router, get_session_manager
 import time
 import os
 
+def count_open_issues(session):
+    """Count open issues in one pass without building a list"""
+    return sum(1 for issue in session.unresolved_issues if issue.get('status') == 'open')
+
 def test_enhanced_wrong_item_handling():
     """Test enhanced wrong item detection and handling"""
     
     print("🍎 Testing Enhanced Wrong Item Handling")
     print("=" * 50)
     
-    router = RouterAgent()
-    session_manager = SessionManager(storage_type="json", storage_path="test_data/sessions")
+    router = get_router()
+    session_manager = get_session_manager(storage_type="json", storage_path="test_data/sessions")
     session = session_manager.get_session("wrong_item_test")
     
     wrong_item_scenarios = [
@@ -40,7 +44,7 @@ def test_enhanced_wrong_item_handling():
         
         print(f"🤖 Kiro: {response_data['response']}")
         print(f"📋 Entities: {session.persistent_entities}")
-        print(f"🚨 Issues: {len([i for i in session.unresolved_issues if i.get('status') == 'open'])} open")
+        print(f"🚨 Issues: {count_open_issues(session)} open")
         
         if session.unresolved_issues:
             latest_issue = session.unresolved_issues[-1]
@@ -52,8 +56,8 @@ def test_multi_intent_response_merging():
     print("\n🔀 Testing Multi-Intent Response Merging")
     print("=" * 50)
     
-    router = RouterAgent()
-    session_manager = SessionManager(storage_type="memory")
+    router = get_router()
+    session_manager = get_session_manager(storage_type="memory")
     
     multi_intent_cases = [
         ("Hi, I'm Sarah and I want a refund for my delayed order", "Should handle greeting + support + order"),
@@ -81,8 +85,8 @@ def test_context_aware_follow_ups():
     print("\n🧠 Testing Context-Aware Follow-ups")
     print("=" * 50)
     
-    router = RouterAgent()
-    session_manager = SessionManager(storage_type="memory")
+    router = get_router()
+    session_manager = get_session_manager(storage_type="memory")
     session = session_manager.get_session("context_test")
     
     conversation_flow = [
@@ -108,7 +112,7 @@ def test_context_aware_follow_ups():
         
         # Show context awareness
         if session.unresolved_issues:
-            print(f"🚨 Open Issues: {len([i for i in session.unresolved_issues if i.get('status') == 'open'])}")
+            print(f"🚨 Open Issues: {count_open_issues(session)}")
 
 def test_session_persistence():
     """Test session persistence across 'server restarts'"""
@@ -118,8 +122,8 @@ def test_session_persistence():
     
     # First session manager instance
     print("📝 Creating first session...")
-    session_manager1 = SessionManager(storage_type="json", storage_path="test_data/persistence")
-    router = RouterAgent()
+    session_manager1 = get_session_manager(storage_type="json", storage_path="test_data/persistence")
+    router = get_router()
     
     session = session_manager1.get_session("persistence_test")
     
@@ -140,7 +144,7 @@ def test_session_persistence():
     print(f"👤 User: {session.user_name}")
     print(f"🚨 Issues: {len(session.unresolved_issues)}")
     
-    # Simulate server restart - create new session manager
+    # Simulate server restart - deliberately a fresh, uncached session manager
     print("\n🔄 Simulating server restart...")
     session_manager2 = SessionManager(storage_type="json", storage_path="test_data/persistence")
     
@@ -171,8 +175,8 @@ def test_human_like_conversation_flow():
     print("\n🤖 Testing Human-Like Conversation Flow")
     print("=" * 50)
     
-    router = RouterAgent()
-    session_manager = SessionManager(storage_type="memory")
+    router = get_router()
+    session_manager = get_session_manager(storage_type="memory")
     session = session_manager.get_session("human_like_test")
     
     # Simulate a realistic customer service conversation
@@ -204,7 +208,7 @@ def test_human_like_conversation_flow():
             print(f"   User: {session.user_name} ({session.communication_style}, {session.user_tone})")
             print(f"   Entities: {session.persistent_entities}")
             print(f"   Empathy Level: {session.empathy_level}")
-            print(f"   Open Issues: {len([i for i in session.unresolved_issues if i.get('status') == 'open'])}")
+            print(f"   Open Issues: {count_open_issues(session)}")
 
 def test_storage_performance():
     """Test storage performance and cleanup"""
@@ -218,11 +222,11 @@ def test_storage_performance():
     for storage_type in storage_types:
         print(f"\n📊 Testing {storage_type} storage...")
         
-        session_manager = SessionManager(
+        session_manager = get_session_manager(
             storage_type=storage_type, 
             storage_path=f"test_data/perf_{storage_type}"
         )
-        router = RouterAgent()
+        router = get_router()
         
         # Create multiple sessions and measure performance
         start_time = time.time()
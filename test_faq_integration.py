@@ -7,7 +7,8 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from agents.dialogue_state_manager import DialogueStateManager, DialogueState, Intent
+from agents.dialogue_state_manager import DialogueState, Intent
+from test_helpers import get_dialogue_manager
 
 def mock_get_order_by_id(order_id):
     """Mock function - not needed for FAQ tests"""
@@ -26,7 +27,7 @@ def test_faq_intent_detection():
     print("🧪 TESTING FAQ INTENT DETECTION")
     print("=" * 60)
     
-    dialogue_manager = DialogueStateManager()
+    dialogue_manager = get_dialogue_manager()
     
     # Test cases that should be detected as FAQ
     faq_test_cases = [
@@ -44,8 +45,10 @@ def test_faq_intent_detection():
     
     all_passed = True
     
-    for message in faq_test_cases:
-        detected_intent = dialogue_manager._detect_intent(message)
+    # Classify every test message in one batched call
+    detected_intents = dialogue_manager.detect_intents_batch(faq_test_cases)
+    
+    for message, detected_intent in zip(faq_test_cases, detected_intents):
         status = "✅ PASS" if detected_intent == Intent.FAQ else "❌ FAIL"
         
         print(f"{status} '{message}' → {detected_intent}")
@@ -104,7 +107,7 @@ def test_end_to_end_faq():
     try:
         from app import get_faq_answer
         
-        dialogue_manager = DialogueStateManager()
+        dialogue_manager = get_dialogue_manager()
         session = create_mock_session()
         
         # Test the exact user query from the problem
@@ -5,6 +5,10 @@ Final validation test for follow-up functionality with correct order states
 
 from agents.human_conversation_manager import HumanConversationManager
 from memory.session_manager import SessionManager
+import re
+
+# Greeting fallback phrases, matched case-insensitively in one pass
+_GREETING_RE = re.compile(r"hello|i'm kiro", re.I)
 
 def test_final_followup_validation():
     """Test that follow-ups work with correct order states"""
@@ -41,13 +45,15 @@ def test_final_followup_validation():
     print(f"   Response: {result3.get('response', '')}")
     
     print("\n4. Validation checks")
+    response2 = result2.get('response', '')
+    response3 = result3.get('response', '')
     checks = {
         "Order state is shipped": session.last_order_state == "shipped",
         "Order ID preserved": session.last_order_id == "1236",
         "Intent preserved": session.last_intent == "tracking",
-        "Follow-up responses include ETA": "tomorrow" in result2.get('response', '').lower(),
-        "No greeting fallbacks": not any(phrase in result2.get('response', '').lower() for phrase in ["hello", "i'm kiro"]),
-        "Order context preserved": "1236" in result2.get('response', '') and "1236" in result3.get('response', '')
+        "Follow-up responses include ETA": "tomorrow" in response2.lower(),
+        "No greeting fallbacks": not _GREETING_RE.search(response2),
+        "Order context preserved": "1236" in response2 and "1236" in response3
     }
     
     all_passed = True
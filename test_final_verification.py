@@ -6,6 +6,14 @@ Final verification test for the tracking bug fix
 from agents.human_conversation_manager import HumanConversationManager
 from memory.session_manager import SessionManager
 import os
+import re
+
+# Criteria checked against every tracking reply below
+_DIGIT_RE = re.compile(r"\d")
+_ASK_ORDER_RE = re.compile(r"provide|please|order number", re.I)
+_TRACKING_RE = re.compile(r"shipped|processing|delivered|on the way", re.I)
+_ERROR_RE = re.compile(r"system error|cannot access", re.I)
+_RESOLUTION_RE = re.compile(r"refund|replacement|how would you like", re.I)
 
 def test_final_verification():
     """Test both cases: with and without order ID"""
@@ -63,11 +71,11 @@ def test_final_verification():
             print(f"Response: {response}")
             
             # Check criteria
-            has_order_id = "#" in response and any(char.isdigit() for char in response)
-            asks_question = "?" in response or any(phrase in response.lower() for phrase in ["provide", "please", "order number"])
-            has_tracking_info = any(word in response.lower() for word in ["shipped", "processing", "delivered", "on the way"])
-            has_error = "system error" in response.lower() or "cannot access" in response.lower()
-            has_resolution_prompt = any(phrase in response.lower() for phrase in ["refund", "replacement", "how would you like"])
+            has_order_id = "#" in response and _DIGIT_RE.search(response) is not None
+            asks_question = "?" in response or bool(_ASK_ORDER_RE.search(response))
+            has_tracking_info = bool(_TRACKING_RE.search(response))
+            has_error = bool(_ERROR_RE.search(response))
+            has_resolution_prompt = bool(_RESOLUTION_RE.search(response))
             
             print(f"✅ Has order ID: {has_order_id}")
             print(f"✅ Asks question: {asks_question}")
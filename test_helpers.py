@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Shared, process-wide instances for the test scripts.
+
+RouterAgent, DialogueStateManager and SessionManager are expensive to build
+(NLU setup, datasets, storage handles), so every test module takes them from
+here instead of constructing its own. Imports are done inside the factories so
+a script only pays for the components it actually uses.
+"""
+
+import functools
+
+@functools.lru_cache(maxsize=1)
+def get_router():
+    """Shared RouterAgent - NLU and agent setup happens once per run"""
+    from agents.router_agent import RouterAgent
+    return RouterAgent()
+
+@functools.lru_cache(maxsize=1)
+def get_dialogue_manager():
+    """Shared DialogueStateManager - state lives on the session, not the manager"""
+    from agents.dialogue_state_manager import DialogueStateManager
+    return DialogueStateManager()
+
+def get_session_manager(storage_type="json", storage_path="data/sessions"):
+    """Shared SessionManager for one storage backend and path"""
+    # Positional call so the cache key is always (storage_type, storage_path)
+    return _session_manager(storage_type, storage_path)
+
+@functools.lru_cache(maxsize=None)
+def _session_manager(storage_type, storage_path):
+    from memory.session_manager import SessionManager
+    return SessionManager(storage_type=storage_type, storage_path=storage_path)
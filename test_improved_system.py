@@ -3,8 +3,9 @@
 Test the improved system that handles both normal conversation and deterministic support
 """
 
-from agents.router_agent import RouterAgent
-from memory.session_manager import SessionManager
+from concurrent.futures import ThreadPoolExecutor
+
+from test_helpers import get_router, get_session_manager
 
 def test_normal_conversations():
     """Test that normal conversations work properly"""
@@ -12,8 +13,8 @@ def test_normal_conversations():
     print("🗣️ Testing Normal Conversations")
     print("=" * 50)
     
-    router = RouterAgent()
-    session_manager = SessionManager(storage_type="memory")
+    router = get_router()
+    session_manager = get_session_manager()
     
     normal_messages = [
         "Hello, how are you?",
@@ -24,12 +25,14 @@ def test_normal_conversations():
         "Thank you for your help"
     ]
     
-    for i, message in enumerate(normal_messages, 1):
+    # One session per message, so the router calls can overlap safely
+    sessions = [session_manager.get_session(f"normal_test_{i}") for i in range(1, len(normal_messages) + 1)]
+    with ThreadPoolExecutor(max_workers=len(normal_messages)) as executor:
+        results = list(executor.map(router.process_with_context, normal_messages, sessions))
+    
+    for i, (message, result) in enumerate(zip(normal_messages, results), 1):
         print(f"\nTest {i}: {message}")
         
-        session = session_manager.get_session(f"normal_test_{i}")
-        result = router.process_with_context(message, session)
-        
         print(f"Response: {result['response'][:100]}...")
         print(f"Agents used: {result['agents_used']}")
         
@@ -46,8 +49,8 @@ def test_support_conversations():
     print("\n🛠️ Testing Support Conversations")
     print("=" * 50)
     
-    router = RouterAgent()
-    session_manager = SessionManager(storage_type="memory")
+    router = get_router()
+    session_manager = get_session_manager()
     
     support_messages = [
         "Order 12345 got wrong item, want refund",
@@ -56,12 +59,14 @@ def test_support_conversations():
         "Order 5555 arrived damaged, want refund"
     ]
     
-    for i, message in enumerate(support_messages, 1):
+    # One session per message, so the router calls can overlap safely
+    sessions = [session_manager.get_session(f"support_test_{i}") for i in range(1, len(support_messages) + 1)]
+    with ThreadPoolExecutor(max_workers=len(support_messages)) as executor:
+        results = list(executor.map(router.process_with_context, support_messages, sessions))
+    
+    for i, (message, result) in enumerate(zip(support_messages, results), 1):
         print(f"\nTest {i}: {message}")
         
-        session = session_manager.get_session(f"support_test_{i}")
-        result = router.process_with_context(message, session)
-        
         print(f"Response: {result['response'][:100]}...")
         print(f"Agents used: {result['agents_used']}")
         
@@ -78,8 +83,8 @@ def test_topic_switching():
     print("\n🔄 Testing Topic Switching")
     print("=" * 50)
     
-    router = RouterAgent()
-    session_manager = SessionManager(storage_type="memory")
+    router = get_router()
+    session_manager = get_session_manager()
     session = session_manager.get_session("topic_switch_test")
     
     # Start with incomplete support request
@@ -3,8 +3,8 @@
 Test the incomplete request flow - asking for missing information only
 """
 
-from agents.router_agent import RouterAgent
-from memory.session_manager import SessionManager
+
+from test_helpers import get_router, get_session_manager
 
 def test_incomplete_request_flow():
     """Test that incomplete requests ask for ONLY the missing part"""
@@ -13,8 +13,8 @@ def test_incomplete_request_flow():
     print("=" * 50)
     
     # Create router and session
-    router = RouterAgent()
-    session_manager = SessionManager(storage_type="memory")
+    router = get_router()
+    session_manager = get_session_manager()
     session = session_manager.get_session("test_incomplete")
     
     # Test scenarios
@@ -74,8 +74,8 @@ def test_never_reset_context():
     print("\n🔒 Testing Context Preservation")
     print("=" * 50)
     
-    router = RouterAgent()
-    session_manager = SessionManager(storage_type="memory")
+    router = get_router()
+    session_manager = get_session_manager()
     session = session_manager.get_session("test_context")
     
     # Step 1: Incomplete request
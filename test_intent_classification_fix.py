@@ -26,12 +26,15 @@ def mock_get_faq_answer(question):
     """Mock FAQ function"""
     return "This is a mock FAQ answer."
 
+class MockSession:
+    """Minimal session object - only carries dialogue_state"""
+    __slots__ = ("dialogue_state",)
+    
+    def __init__(self):
+        self.dialogue_state = None
+
 def create_mock_session():
     """Create a mock session object"""
-    class MockSession:
-        def __init__(self):
-            self.dialogue_state = None
-    
     return MockSession()
 
 def test_intent_priority_order():
@@ -71,8 +74,10 @@ def test_intent_priority_order():
     
     all_passed = True
     
-    for message, expected_intent in test_cases:
-        detected_intent = dialogue_manager._detect_intent(message)
+    # Classify every message in one batch call, then check against expected
+    detected_intents = dialogue_manager.detect_intents_batch([message for message, _ in test_cases])
+    
+    for (message, expected_intent), detected_intent in zip(test_cases, detected_intents):
         status = "✅ PASS" if detected_intent == expected_intent else "❌ FAIL"
         
         print(f"{status} '{message}' → Expected: {expected_intent}, Got: {detected_intent}")
@@ -109,14 +114,15 @@ def test_order_detail_workflow():
     )
     
     response = result.get('response', '')
+    response_lower = response.lower()
     print(f"Response: {response}")
     
     # Validate response
     success_checks = [
         ("Contains price", "₹27,357" in response),
         ("Contains order ID", "90495" in response),
-        ("No billing explanation", "billing" not in response.lower()),
-        ("No refund mention", "refund" not in response.lower()),
+        ("No billing explanation", "billing" not in response_lower),
+        ("No refund mention", "refund" not in response_lower),
         ("Clean factual answer", len(response.split('\n')) <= 2),  # Should be concise
     ]
     
@@ -149,6 +155,7 @@ def test_validation_requirement():
     )
     
     response = result.get('response', '')
+    response_lower = response.lower()
     print(f"Bot: {response}")
     
     # Validation checks
@@ -157,8 +164,8 @@ def test_validation_requirement():
     validation_checks = [
         ("Contains correct price", "₹27,357" in response or "27357" in response),
         ("Contains order number", "90495" in response),
-        ("No billing explanations", not any(word in response.lower() for word in ["billing", "charge", "refund", "payment"])),
-        ("Clean response format", "price" in response.lower()),
+        ("No billing explanations", not any(word in response_lower for word in ["billing", "charge", "refund", "payment"])),
+        ("Clean response format", "price" in response_lower),
     ]
     
     all_valid = True
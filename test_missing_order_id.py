@@ -3,9 +3,15 @@
 Test the fix for tracking requests without order IDs
 """
 
+import re
+
 from agents.router_agent import RouterAgent
 from memory.session_manager import SessionMemory
 
+# A tracking request without an order id should be asked for one, not hit an error
+_ASK_ORDER_RE = re.compile(r"order number|provide|please|track your order", re.I)
+_ERROR_RE = re.compile(r"system error|cannot access", re.I)
+
 def test_tracking_without_order_id():
     """Test tracking requests without order numbers"""
     
@@ -24,8 +30,8 @@ def test_tracking_without_order_id():
         "when will my order arrive"
     ]
     
-    for test_message in test_cases:
-        session = SessionMemory(f"test_{hash(test_message)}")
+    for i, test_message in enumerate(test_cases):
+        session = SessionMemory(f"test_{i}")
         
         print(f"\nInput: '{test_message}'")
         
@@ -40,11 +46,9 @@ def test_tracking_without_order_id():
             print(f"Agents: {agents_used}")
             
             # Check if it asks for order number instead of crashing
-            asks_for_order = any(phrase in response.lower() for phrase in [
-                "order number", "provide", "please", "track your order"
-            ])
+            asks_for_order = bool(_ASK_ORDER_RE.search(response))
             
-            has_error = "system error" in response.lower() or "cannot access" in response.lower()
+            has_error = bool(_ERROR_RE.search(response))
             
             if asks_for_order and not has_error:
                 print("✅ SUCCESS: Asks for order number")
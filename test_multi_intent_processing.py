@@ -3,9 +3,43 @@
 Test script specifically for the enhanced multi-intent processing and session memory handling
 """
 
-from memory.session_manager import SessionManager
+from test_helpers import get_session_manager
 import time
 import os
+import re
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+# Markers of a natural, personalised multi-intent reply (quality analysis)
+_TRANSITIONS_RE = re.compile(r"regarding|as for|about|first|also|finally", re.I)
+_GREETINGS_RE = re.compile(r"i can help|i understand|let me", re.I)
+
+# Static test inputs, built once per process
+MULTI_INTENT_MESSAGES = (
+    "I want a refund and my delivery is delayed",
+    "Track order #12345 and tell me about iPhone pricing", 
+    "I need support for my account and want to cancel my order",
+    "My order is late and I received the wrong item"
+)
+
+CONVERSATION_FLOW = (
+    ("Hi, I'm Alice", "Should learn user name"),
+    ("I have order #MEMORY123", "Should remember order number"),
+    ("I ordered red apples but got green apples", "Should detect wrong item and remember context"),
+    ("track it", "Should use remembered order number"),
+    ("I want a refund", "Should use full context (order + wrong item)"),
+    ("How long will it take?", "Should use refund context")
+)
+
+MERGE_SESSION_IDS = tuple(f"merge_test_{i}" for i in range(len(MULTI_INTENT_MESSAGES)))
+
+EDGE_CASES = (
+    "",  # Empty message
+    "   ",  # Whitespace only
+    "a" * 1000,  # Very long message
+    "🎉🎊🎈",  # Emoji only
+    "123456789",  # Numbers only
+)
 
 def test_enhanced_multi_intent_processing():
     """Test the enhanced multi-intent processing with proper session management"""
@@ -19,38 +53,38 @@ def test_enhanced_multi_intent_processing():
     from app import process_message_with_multi_intent
     
     # Initialize session manager
-    session_manager = SessionManager(storage_type="memory")
+    session_manager = get_session_manager()
     
     test_cases = [
         {
             "name": "Multi-Intent: Support + Order",
             "message": "I want a refund and my delivery is delayed for order #12345",
-            "expected_intents": ["support", "order"],
-            "expected_agents": ["support", "order"]
+            "expected_intents": frozenset({"support", "order"}),
+            "expected_agents": frozenset({"support", "order"})
         },
         {
             "name": "Multi-Intent: Order + Product",
             "message": "Track my order #98765 and tell me about iPhone pricing",
-            "expected_intents": ["order", "product"],
-            "expected_agents": ["order", "product"]
+            "expected_intents": frozenset({"order", "product"}),
+            "expected_agents": frozenset({"order", "product"})
         },
         {
             "name": "Single Intent with Context",
             "message": "track it",  # Should use session context
-            "expected_intents": ["order"],
-            "expected_agents": ["order"]
+            "expected_intents": frozenset({"order"}),
+            "expected_agents": frozenset({"order"})
         },
         {
             "name": "Wrong Item Multi-Intent",
             "message": "I ordered red apples but got green apples and want a refund",
-            "expected_intents": ["support", "order", "product"],
-            "expected_agents": ["support", "order", "product"]
+            "expected_intents": frozenset({"support", "order", "product"}),
+            "expected_agents": frozenset({"support", "order", "product"})
         },
         {
             "name": "Follow-up with Session Memory",
             "message": "How much will the refund be?",
-            "expected_intents": ["support"],
-            "expected_agents": ["support"]
+            "expected_intents": frozenset({"support"}),
+            "expected_agents": frozenset({"support"})
         }
     ]
     
@@ -64,39 +98,41 @@ def test_enhanced_multi_intent_processing():
             # Process message with enhanced multi-intent handling
             result = process_message_with_multi_intent(test_case['message'], session)
             
+            intents = result['intents']
+            agents = result['agents_used']
+            
             # Verify results
             print(f"✅ Response: {result['response'][:100]}...")
-            print(f"🎯 Detected Intents: {result['intents']}")
-            print(f"🤖 Agents Used: {result['agents_used']}")
+            print(f"🎯 Detected Intents: {intents}")
+            print(f"🤖 Agents Used: {agents}")
             print(f"🔄 Multi-Intent: {result['is_multi_intent']}")
             print(f"📊 Processing Steps: {len(result.get('processing_steps', []))}")
             print(f"⭐ Response Quality: {result.get('response_quality', 'unknown')}")
             
             # Check if expected intents were detected
-            detected_intents = set(result['intents'])
-            expected_intents = set(test_case['expected_intents'])
+            detected_intents = set(intents)
+            expected_intents = test_case['expected_intents']
             
             if expected_intents.issubset(detected_intents):
                 print(f"✅ Intent detection: PASSED")
             else:
-                print(f"❌ Intent detection: FAILED (expected {expected_intents}, got {detected_intents})")
+                print(f"❌ Intent detection: FAILED (expected {set(expected_intents)}, got {detected_intents})")
             
             # Check if expected agents were used
-            agents_used = set(result['agents_used'])
-            expected_agents = set(test_case['expected_agents'])
+            agents_used = set(agents)
+            expected_agents = test_case['expected_agents']
             
             # Allow for routing variations (e.g., general agent for low confidence)
             if expected_agents.intersection(agents_used) or 'general' in agents_used:
                 print(f"✅ Agent routing: PASSED")
             else:
-                print(f"❌ Agent routing: FAILED (expected {expected_agents}, got {agents_used})")
+                print(f"❌ Agent routing: FAILED (expected {set(expected_agents)}, got {agents_used})")
             
             # Update session
             session_manager.update_session(session)
             
         except Exception as e:
             print(f"❌ Test failed with error: {e}")
-            import traceback
             traceback.print_exc()
 
 def test_session_memory_persistence():
@@ -107,21 +143,12 @@ def test_session_memory_persistence():
     
     from app import process_message_with_multi_intent
     
-    session_manager = SessionManager(storage_type="memory")
+    session_manager = get_session_manager()
     session = session_manager.get_session("memory_test")
     
-    conversation_flow = [
-        ("Hi, I'm Alice", "Should learn user name"),
-        ("I have order #MEMORY123", "Should remember order number"),
-        ("I ordered red apples but got green apples", "Should detect wrong item and remember context"),
-        ("track it", "Should use remembered order number"),
-        ("I want a refund", "Should use full context (order + wrong item)"),
-        ("How long will it take?", "Should use refund context")
-    ]
-    
     print("🎭 Conversation Flow Test:")
     
-    for i, (message, expectation) in enumerate(conversation_flow):
+    for i, (message, expectation) in enumerate(CONVERSATION_FLOW):
         print(f"\n{i+1}. 👤 Alice: '{message}'")
         print(f"   🎯 Expected: {expectation}")
         
@@ -132,7 +159,7 @@ def test_session_memory_persistence():
             print(f"   🤖 Kiro: {result['response'][:80]}...")
             print(f"   📋 Session Entities: {session.persistent_entities}")
             print(f"   👤 User: {session.user_name}")
-            print(f"   🚨 Open Issues: {len([i for i in session.unresolved_issues if i.get('status') == 'open'])}")
+            print(f"   🚨 Open Issues: {sum(1 for i in session.unresolved_issues if i.get('status') == 'open')}")
             
             # Verify session memory is working
             if i == 1 and session.user_name:
@@ -155,22 +182,24 @@ def test_response_merging_quality():
     
     from app import process_message_with_multi_intent
     
-    session_manager = SessionManager(storage_type="memory")
+    session_manager = get_session_manager()
     
-    multi_intent_messages = [
-        "I want a refund and my delivery is delayed",
-        "Track order #12345 and tell me about iPhone pricing", 
-        "I need support for my account and want to cancel my order",
-        "My order is late and I received the wrong item"
-    ]
+    multi_intent_messages = MULTI_INTENT_MESSAGES
     
-    for i, message in enumerate(multi_intent_messages):
-        session = session_manager.get_session(f"merge_test_{i}")
-        
+    # Sessions are independent, so run every message concurrently and report
+    # in input order; future.result() re-raises a message's own error below
+    sessions = [session_manager.get_session(session_id) for session_id in MERGE_SESSION_IDS]
+    with ThreadPoolExecutor(max_workers=len(multi_intent_messages)) as executor:
+        futures = [
+            executor.submit(process_message_with_multi_intent, message, session)
+            for message, session in zip(multi_intent_messages, sessions)
+        ]
+    
+    for message, future in zip(multi_intent_messages, futures):
         print(f"\n📝 Message: '{message}'")
         
         try:
-            result = process_message_with_multi_intent(message, session)
+            result = future.result()
             
             print(f"🎯 Intents: {result['intents']}")
             print(f"🤖 Agents: {result['agents_used']}")
@@ -179,13 +208,15 @@ def test_response_merging_quality():
             
             # Analyze response quality
             response = result['response']
+            if not response:
+                print(f"📊 Quality Analysis: ❌ Empty response")
+                continue
             
             # Check for natural transitions
-            transition_words = ['regarding', 'as for', 'about', 'first', 'also', 'finally']
-            has_transitions = any(word in response.lower() for word in transition_words)
+            has_transitions = _TRANSITIONS_RE.search(response) is not None
             
             # Check for personalization
-            has_greeting = any(word in response.lower() for word in ['i can help', 'i understand', 'let me'])
+            has_greeting = _GREETINGS_RE.search(response) is not None
             
             # Check response length (should be comprehensive for multi-intent)
             is_comprehensive = len(response) > 100 if result['is_multi_intent'] else True
@@ -207,19 +238,11 @@ def test_error_handling():
     
     from app import process_message_with_multi_intent
     
-    session_manager = SessionManager(storage_type="memory")
+    session_manager = get_session_manager()
     session = session_manager.get_session("error_test")
     
     # Test edge cases
-    edge_cases = [
-        "",  # Empty message
-        "   ",  # Whitespace only
-        "a" * 1000,  # Very long message
-        "🎉🎊🎈",  # Emoji only
-        "123456789",  # Numbers only
-    ]
-    
-    for i, message in enumerate(edge_cases):
+    for i, message in enumerate(EDGE_CASES):
         print(f"\n🧪 Edge Case {i+1}: '{message[:50]}{'...' if len(message) > 50 else ''}'")
         
         try:
@@ -246,5 +269,4 @@ if __name__ == "__main__":
         
     except Exception as e:
         print(f"\n❌ Test suite failed with error: {e}")
-        import traceback
         traceback.print_exc()
\ No newline at end of file
@@ -7,6 +7,9 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# The actual order statuses present in the dataset
+VALID_STATUSES = frozenset({"In Transit", "Delivered", "Processing", "Shipped", "Cancelled"})
+
 def test_data_access():
     """Test the simplified data access function"""
     print("🧪 TESTING REAL DATASET ACCESS")
@@ -149,9 +152,7 @@ def test_no_fake_statuses():
             print(f"Real status from dataset: {real_status}")
             
             # Verify it's one of the actual statuses in the dataset
-            valid_statuses = ["In Transit", "Delivered", "Processing", "Shipped", "Cancelled"]
-            
-            if real_status in valid_statuses:
+            if real_status in VALID_STATUSES:
                 print("✅ Status is from real dataset")
                 return True
             else:
@@ -3,9 +3,16 @@
 Test the specific bug case mentioned in the request
 """
 
+import re
+
 from agents.router_agent import RouterAgent
 from memory.session_manager import SessionMemory
 
+# Symptoms of the bug: tracking requests answered with the resolution prompt or an access error
+_RESOLUTION_RE = re.compile(r"refund|replacement|how would you like me to help", re.I)
+_ORDER_INFO_ERROR_RE = re.compile(r"cannot access order information", re.I)
+_TRACKING_RE = re.compile(r"shipped|on the way|delivered|processing", re.I)
+
 def test_specific_bug_case():
     """Test the exact case mentioned in the bug report"""
     
@@ -36,16 +43,11 @@ def test_specific_bug_case():
         print(f"✅ Agents Used: {agents_used}")
         
         # Check for the specific issues mentioned in the bug report
-        has_refund_replacement_prompt = any(phrase in response.lower() for phrase in [
-            "refund", "replacement", "how would you like me to help", 
-            "refund, replacement, cancellation"
-        ])
+        has_refund_replacement_prompt = bool(_RESOLUTION_RE.search(response))
         
-        has_order_info_error = "cannot access order information" in response.lower()
+        has_order_info_error = bool(_ORDER_INFO_ERROR_RE.search(response))
         
-        has_tracking_info = any(word in response.lower() for word in [
-            "shipped", "on the way", "delivered", "processing"
-        ])
+        has_tracking_info = bool(_TRACKING_RE.search(response))
         
         has_order_id = "#4457" in response
         
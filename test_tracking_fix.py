@@ -6,8 +6,14 @@ Test script to verify the tracking bug fix
 from agents.router_agent import RouterAgent
 from agents.nlp_processor import NLPProcessor
 from memory.session_manager import SessionMemory
+import re
 import sys
 
+# A fixed tracking reply names the order and its status, with no resolution prompt
+_DIGIT_RE = re.compile(r"\d")
+_STATUS_RE = re.compile(r"shipped|processing|delivered|being processed|on the way", re.I)
+_RESOLUTION_RE = re.compile(r"refund|replacement|cancellation|how would you like", re.I)
+
 def test_tracking_queries():
     """Test that tracking queries work correctly without resolution prompts"""
     
@@ -67,10 +73,10 @@ def test_tracking_queries():
             print(f"  Agents Used: {agents_used}")
             
             # Validation checks
-            has_order_id = "#" in response and any(char.isdigit() for char in response)
-            has_status = any(word in response.lower() for word in ["shipped", "processing", "delivered", "being processed", "on the way"])
+            has_order_id = "#" in response and _DIGIT_RE.search(response) is not None
+            has_status = bool(_STATUS_RE.search(response))
             has_question = "?" in response
-            has_resolution_prompt = any(phrase in response.lower() for phrase in ["refund", "replacement", "cancellation", "how would you like"])
+            has_resolution_prompt = bool(_RESOLUTION_RE.search(response))
             
             print(f"  ✅ Contains order ID: {has_order_id}")
             print(f"  ✅ Contains order status: {has_status}")
@@ -6,6 +6,12 @@ Test the tracking fix through the web interface flow
 from agents.human_conversation_manager import HumanConversationManager
 from memory.session_manager import SessionManager
 import os
+import re
+
+# A tracking reply must not fall into the refund/replacement resolution prompt
+_RESOLUTION_RE = re.compile(r"refund|replacement|how would you like", re.I)
+_ORDER_INFO_ERROR_RE = re.compile(r"cannot access order information", re.I)
+_TRACKING_RE = re.compile(r"shipped|on the way|delivered|processing", re.I)
 
 def test_web_interface_flow():
     """Test the tracking fix through the complete web interface flow"""
@@ -44,16 +50,11 @@ def test_web_interface_flow():
         print(f"✅ Is Human Flow: {is_human_flow}")
         
         # Validate the response
-        has_refund_replacement_prompt = any(phrase in response_text.lower() for phrase in [
-            "refund", "replacement", "how would you like me to help", 
-            "refund, replacement, cancellation"
-        ])
+        has_refund_replacement_prompt = bool(_RESOLUTION_RE.search(response_text))
         
-        has_order_info_error = "cannot access order information" in response_text.lower()
+        has_order_info_error = bool(_ORDER_INFO_ERROR_RE.search(response_text))
         
-        has_tracking_info = any(word in response_text.lower() for word in [
-            "shipped", "on the way", "delivered", "processing"
-        ])
+        has_tracking_info = bool(_TRACKING_RE.search(response_text))
         
         has_order_id = "#4457" in response_text
         
@@ -91,8 +92,8 @@ def test_web_interface_flow():
             result = human_conversation_manager.process_human_conversation(case, session)
             response = result.get('response', '')
             
-            has_tracking = any(word in response.lower() for word in ["shipped", "processing", "delivered", "on the way"])
-            has_resolution_prompt = any(phrase in response.lower() for phrase in ["refund", "replacement", "how would you like"])
+            has_tracking = bool(_TRACKING_RE.search(response))
+            has_resolution_prompt = bool(_RESOLUTION_RE.search(response))
             
             if has_tracking and not has_resolution_prompt:
                 print(f"  ✅ SUCCESS: {response}")
@@ -3,18 +3,49 @@ Text-to-Speech Engine for Chatbot
 Uses Coqui TTS for natural voice generation
 """
 
+import functools
+import itertools
 import os
+import queue
 import threading
 import time
 from pathlib import Path
 from typing import Optional
-import uuid
 
 # Global TTS model instance (loaded once at startup)
 _tts_model = None
 _model_loaded = False
 _model_lock = threading.Lock()
 
+# Per-process sequence for audio filenames (no urandom read per file)
+_audio_seq = itertools.count()
+
+# Opt-in int8 dynamic quantization of the TTS model, off unless TTS_INT8=1
+TTS_INT8 = os.getenv('TTS_INT8') == '1'
+
+# Pending async speech requests, drained by one long-lived worker thread
+_speech_queue = queue.Queue()
+_speech_worker = None
+_speech_worker_lock = threading.Lock()
+
+def _quantize_tts_model(tts) -> None:
+    """
+    Swap the synthesizer's Linear/LSTM/GRU layers for int8 dynamically
+    quantized ones. Falls back to the FP32 model if quantization fails.
+    """
+    try:
+        import torch
+        
+        synthesizer = tts.synthesizer
+        synthesizer.tts_model = torch.quantization.quantize_dynamic(
+            synthesizer.tts_model,
+            {torch.nn.Linear, torch.nn.LSTM, torch.nn.GRU},
+            dtype=torch.qint8
+        )
+        print("✅ TTS model quantized to int8")
+    except Exception as e:
+        print(f"⚠️ TTS int8 quantization failed, using FP32 model: {e}")
+
 def initialize_tts():
     """
     Initialize TTS model once at application startup.
@@ -43,6 +74,8 @@ def initialize_tts():
                 print(f"📥 Loading TTS model: {model_name}")
                 
                 _tts_model = TTS(model_name=model_name)
+                if TTS_INT8:
+                    _quantize_tts_model(_tts_model)
                 _model_loaded = True
                 
                 print("✅ TTS engine initialized successfully")
@@ -57,31 +90,41 @@ def is_tts_available() -> bool:
     """Check if TTS is available and initialized"""
     return _model_loaded and _tts_model is not None
 
+@functools.lru_cache(maxsize=1024)
 def should_speak_text(text: str) -> bool:
     """
     Determine if text should be spoken based on length and content.
     RULE: Only speak short responses (1-2 sentences)
     """
-    if not text or len(text.strip()) == 0:
+    if not text or text.isspace():
         return False
     
-    # Count sentences (rough estimation)
-    sentence_count = text.count('.') + text.count('!') + text.count('?')
-    
-    # Don't speak very long responses
+    # Don't speak very long responses - checked first, before any scans
     if len(text) > 200:
         return False
     
-    # Don't speak if too many sentences
-    if sentence_count > 3:
+    # Don't speak lists or structured content
+    if '•' in text or text.count('\n') > 2:
         return False
     
-    # Don't speak lists or structured content
-    if text.count('\n') > 2 or text.count('•') > 0:
+    # Don't speak if too many sentences (rough estimation)
+    sentence_count = text.count('.') + text.count('!') + text.count('?')
+    if sentence_count > 3:
         return False
     
     return True
 
+# Markdown asterisks dropped, symbols spoken as words - one translate pass
+_SPEECH_TRANSLATION = str.maketrans({
+    '*': None,
+    '&': ' and ',
+    '@': ' at ',
+    '#': ' number ',
+    '₹': ' rupees ',
+    '$': ' dollars ',
+})
+
+@functools.lru_cache(maxsize=1024)
 def clean_text_for_speech(text: str) -> str:
     """
     Clean text for better speech synthesis.
@@ -90,15 +133,8 @@ def clean_text_for_speech(text: str) -> str:
     if not text:
         return ""
     
-    # Remove markdown formatting
-    cleaned = text.replace('**', '').replace('*', '')
-    
-    # Replace common symbols with words
-    cleaned = cleaned.replace('&', ' and ')
-    cleaned = cleaned.replace('@', ' at ')
-    cleaned = cleaned.replace('#', ' number ')
-    cleaned = cleaned.replace('₹', ' rupees ')
-    cleaned = cleaned.replace('$', ' dollars ')
+    # Remove markdown formatting and replace common symbols with words
+    cleaned = text.translate(_SPEECH_TRANSLATION)
     
     # Remove extra whitespace
     cleaned = ' '.join(cleaned.split())
@@ -142,10 +178,10 @@ def speak(text: str, output_path: Optional[str] = None) -> Optional[str]:
             audio_dir = Path("static/audio")
             audio_dir.mkdir(parents=True, exist_ok=True)
             
-            # Use timestamp + UUID for unique filename
+            # Timestamp + PID + per-process sequence is unique across workers
+            # and restarts without reading the kernel RNG
             timestamp = int(time.time())
-            unique_id = str(uuid.uuid4())[:8]
-            output_path = audio_dir / f"speech_{timestamp}_{unique_id}.wav"
+            output_path = audio_dir / f"speech_{timestamp}_{os.getpid()}_{next(_audio_seq)}.wav"
         
         print(f"🎤 Generating speech: '{clean_text[:50]}...'")
         
@@ -160,28 +196,41 @@ def speak(text: str, output_path: Optional[str] = None) -> Optional[str]:
         print(f"❌ Speech generation failed: {e}")
         return None
 
+def _speech_worker_loop():
+    """Synthesize queued requests one at a time, in arrival order"""
+    while True:
+        text, callback = _speech_queue.get()
+        try:
+            audio_path = speak(text)
+            if callback and audio_path:
+                callback(audio_path)
+        except Exception as e:
+            print(f"❌ Async speech generation failed: {e}")
+        finally:
+            _speech_queue.task_done()
+
 def speak_async(text: str, callback=None) -> threading.Thread:
     """
     Generate speech asynchronously to avoid blocking the main thread.
+    Requests are queued for a single worker thread, since the model
+    only synthesizes one utterance at a time anyway.
     
     Args:
         text: Text to convert to speech
         callback: Optional callback function to call when done
         
     Returns:
-        Thread object
+        The speech worker thread
     """
-    def _async_speak():
-        try:
-            audio_path = speak(text)
-            if callback and audio_path:
-                callback(audio_path)
-        except Exception as e:
-            print(f"❌ Async speech generation failed: {e}")
+    global _speech_worker
+    
+    with _speech_worker_lock:
+        if _speech_worker is None:
+            _speech_worker = threading.Thread(target=_speech_worker_loop, daemon=True)
+            _speech_worker.start()
     
-    thread = threading.Thread(target=_async_speak, daemon=True)
-    thread.start()
-    return thread
+    _speech_queue.put((text, callback))
+    return _speech_worker
 
 def cleanup_old_audio_files(max_age_minutes: int = 30):
     """
@@ -199,14 +248,19 @@ def cleanup_old_audio_files(max_age_minutes: int = 30):
         max_age_seconds = max_age_minutes * 60
         
         deleted_count = 0
-        for audio_file in audio_dir.glob("speech_*.wav"):
-            try:
-                file_age = current_time - audio_file.stat().st_mtime
-                if file_age > max_age_seconds:
-                    audio_file.unlink()
-                    deleted_count += 1
-            except Exception as e:
-                print(f"⚠️ Error deleting {audio_file}: {e}")
+        # scandir entries carry their directory-read metadata, so each file
+        # costs one stat at most instead of glob's stat plus ours
+        with os.scandir(audio_dir) as entries:
+            for entry in entries:
+                if not (entry.name.startswith("speech_") and entry.name.endswith(".wav")):
+                    continue
+                try:
+                    file_age = current_time - entry.stat().st_mtime
+                    if file_age > max_age_seconds:
+                        os.unlink(entry.path)
+                        deleted_count += 1
+                except Exception as e:
+                    print(f"⚠️ Error deleting {entry.path}: {e}")
         
         if deleted_count > 0:
             print(f"🧹 Cleaned up {deleted_count} old audio files")
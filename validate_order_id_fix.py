@@ -3,7 +3,7 @@
 Simple validation script for order ID extraction fix
 """
 
-import re
+from data.order_id import ORDER_ID_RE
 
 def extract_order_id_fixed(message: str):
     """
@@ -12,7 +12,7 @@ def extract_order_id_fixed(message: str):
     Extract ONLY the numeric portion and return as integer.
     """
     # STRICT RULE: Extract FIRST numeric sequence from ANY format
-    match = re.search(r'(\d+)', message)
+    match = ORDER_ID_RE.search(message)
     if match:
         order_id = int(match.group(1))
         print(f"📋 Extracted order ID: {order_id} from input: '{message}'")
@@ -6,48 +6,65 @@ Quick validation of the refactored data-driven system
 import sys
 import os
 import json
+import re
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Order id patterns tried in order by the router check
+ORDER_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'\b(ORD\d+)\b',
+        r'#(\d+)',
+        r'order\s*#?\s*(ORD\d+)',
+        r'order\s*#?\s*(\d{5,8})'
+    )
+]
+
 # Test dataset loading
 def test_datasets():
     print("🧪 Testing dataset loading...")
     
     try:
-        # Load customer order dataset
-        with open('datasets/customer_order_dataset.json', 'r') as f:
-            orders_data = json.load(f)
-        
-        # Flatten orders
-        flattened_orders = []
-        for customer in orders_data:
-            for order in customer['orders']:
-                order_record = {
-                    'customer_id': customer['customer_id'],
-                    'customer_name': customer['name'],
-                    'order_id': order['order_id'],
-                    'product': order['product'],
-                    'platform': order['platform'],
-                    'status': order['status'],
-                    'payment_mode': order['payment_mode'],
-                    'amount': order['amount']
-                }
-                flattened_orders.append(order_record)
+        # Load customer order dataset (orjson parses the raw bytes when available)
+        if orjson:
+            with open('datasets/customer_order_dataset.json', 'rb') as f:
+                orders_data = orjson.loads(f.read())
+        else:
+            with open('datasets/customer_order_dataset.json', 'r') as f:
+                orders_data = json.load(f)
         
-        orders_df = pd.DataFrame(flattened_orders)
+        # Flatten orders - one row per order with its customer fields
+        orders_df = pd.json_normalize(orders_data, record_path='orders', meta=['customer_id', 'name'])
+        orders_df = orders_df.rename(columns={'name': 'customer_name'}).reindex(columns=[
+            'customer_id', 'customer_name', 'order_id', 'product',
+            'platform', 'status', 'payment_mode', 'amount'
+        ])
         
         # Load FAQ dataset
-        with open('datasets/ai_customer_support_data.json', 'r') as f:
-            faq_data = json.load(f)
+        if orjson:
+            with open('datasets/ai_customer_support_data.json', 'rb') as f:
+                faq_data = orjson.loads(f.read())
+        else:
+            with open('datasets/ai_customer_support_data.json', 'r') as f:
+                faq_data = json.load(f)
         
         faq_df = pd.DataFrame(faq_data)
         
         print(f"✅ Orders dataset: {len(orders_df)} records")
         print(f"✅ FAQ dataset: {len(faq_df)} records")
         
-        # Test order lookup
-        test_order = orders_df[orders_df['order_id'] == 'ORD54582']
-        if not test_order.empty:
-            order_details = test_order.iloc[0].to_dict()
+        # Test order lookup - hash index by order_id, as the app serves it
+        orders_by_id = {}
+        for record in orders_df.to_dict('records'):
+            orders_by_id.setdefault(record['order_id'], record)
+        
+        order_details = orders_by_id.get('ORD54582')
+        if order_details:
             print(f"✅ Order lookup test: Found {order_details['product']} - {order_details['status']}")
         
         # Test FAQ lookup
@@ -81,17 +98,9 @@ def test_conversation_router():
             "#12345"
         ]
         
-        import re
-        patterns = [
-            r'\b(ORD\d+)\b',
-            r'#(\d+)',
-            r'order\s*#?\s*(ORD\d+)',
-            r'order\s*#?\s*(\d{5,8})'
-        ]
-        
         for msg in test_messages:
-            for pattern in patterns:
-                match = re.search(pattern, msg, re.IGNORECASE)
+            for pattern in ORDER_PATTERNS:
+                match = pattern.search(msg)
                 if match:
                     order_id = match.group(1)
                     print(f"✅ Order ID extraction: '{msg}' → {order_id}")